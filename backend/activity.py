@@ -0,0 +1,89 @@
+"""Daily activity as one bitmap document per user and year.
+
+    db.activity {"_id": "<user_id>:<year>", "user_id", "year", "days": {"<word>": int}}
+
+Bit (day_of_year % 32) of word (day_of_year // 32) is set when the user was
+active that UTC day (0-based day of year). Recording a day is a single
+upserted `$bit` write, and a full history is a handful of small documents,
+so heatmaps and streaks are computed from the bitmaps rather than trusted
+from the counters on the user.
+"""
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+WORD_BITS = 32
+
+
+def _slot(day: date) -> Tuple[int, int]:
+    return divmod(day.timetuple().tm_yday - 1, WORD_BITS)
+
+
+def record(user_id: str, day: date) -> Tuple[dict, dict]:
+    """(filter, update) marking `day` active; apply with upsert=True."""
+    word, bit = _slot(day)
+    return (
+        {"_id": f"{user_id}:{day.year}"},
+        {
+            "$bit": {f"days.{word}": {"or": 1 << bit}},
+            "$setOnInsert": {"user_id": user_id, "year": day.year},
+        },
+    )
+
+
+def pack(days: Iterable[date]) -> Dict[int, Dict[str, int]]:
+    """Group days into {year: {word: bits}} for backfilling."""
+    years: Dict[int, Dict[str, int]] = {}
+    for day in days:
+        word, bit = _slot(day)
+        words = years.setdefault(day.year, {})
+        words[str(word)] = words.get(str(word), 0) | 1 << bit
+    return years
+
+
+def _year_bits(doc: dict) -> int:
+    bits = 0
+    for word, value in (doc.get("days") or {}).items():
+        bits |= int(value) << int(word) * WORD_BITS
+    return bits
+
+
+def active_days(docs: Iterable[dict]) -> List[date]:
+    days = []
+    for doc in sorted(docs, key=lambda d: d["year"]):
+        start = date(doc["year"], 1, 1)
+        bits = _year_bits(doc)
+        while bits:
+            low = bits & -bits
+            days.append(start + timedelta(days=low.bit_length() - 1))
+            bits ^= low
+    return days
+
+
+def streaks(docs: List[dict], today: date) -> Tuple[int, int]:
+    """(current, longest) run of consecutive active days.
+
+    The current streak is still alive if its last day is today or yesterday,
+    matching how login streaks lapse.
+    """
+    if not docs:
+        return 0, 0
+    # Lay every year out on one timeline starting at the first recorded year
+    first_year = min(doc["year"] for doc in docs)
+    origin = date(first_year, 1, 1)
+    timeline = 0
+    for doc in docs:
+        timeline |= _year_bits(doc) << (date(doc["year"], 1, 1) - origin).days
+
+    longest, run = 0, timeline
+    while run:
+        run &= run >> 1
+        longest += 1
+
+    current = 0
+    index = (today - origin).days
+    if index >= 0 and not timeline >> index & 1:
+        index -= 1
+    while index >= 0 and timeline >> index & 1:
+        current += 1
+        index -= 1
+    return current, longest
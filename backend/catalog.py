@@ -0,0 +1,151 @@
+"""In-process copy of the course catalog.
+
+Courses and module metadata (everything except module bodies) are small and
+change only when the catalog is re-seeded, so each API process keeps them in
+memory. Writers bump `db.catalog_meta` {"_id": "catalog", "version": n}; the
+catalog polls that single document at most every `refresh_seconds` and
+reloads when the version moved. The poll and the reload share a causally
+consistent session, so when they are served by (different) secondaries the
+reload never sees data older than the version that triggered it.
+
+Faceted browsing is answered from bitmasks built once per version: each
+(field, value) pair maps to an int with one bit per course, so filtering and
+facet counting are a handful of integer ANDs, and results are memoized until
+the next reload.
+"""
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pymongo import ReturnDocument
+
+import completion
+
+CATALOG_META_ID = "catalog"
+FACET_FIELDS = ("category", "difficulty", "requires_terms")
+SEARCH_CACHE_SIZE = 1024
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+async def bump_catalog_version(db) -> int:
+    meta = await db.catalog_meta.find_one_and_update(
+        {"_id": CATALOG_META_ID}, {"$inc": {"version": 1}}, upsert=True, return_document=ReturnDocument.AFTER
+    )
+    return meta["version"]
+
+
+class Catalog:
+    def __init__(self, refresh_seconds: float = 30.0):
+        self.refresh_seconds = refresh_seconds
+        self.version: Optional[int] = None
+        self.courses: Dict[str, dict] = {}
+        # course_id -> module metadata sorted by `order`
+        self.modules: Dict[str, List[dict]] = {}
+        self._module_slots: Dict[str, Dict[str, int]] = {}
+        self._checked_at = float("-inf")
+        self._course_list: List[dict] = []
+        self._facet_masks: Dict[str, Dict[object, int]] = {}
+        self._titles: List[Tuple[str, int]] = []
+        self._search_cache: Dict[tuple, Tuple[List[dict], Dict[str, Dict[object, int]]]] = {}
+
+    async def ensure_fresh(self, db):
+        now = time.monotonic()
+        if now - self._checked_at < self.refresh_seconds:
+            return
+        self._checked_at = now
+        async with await db.client.start_session(causal_consistency=True) as session:
+            meta = await db.catalog_meta.find_one({"_id": CATALOG_META_ID}, session=session)
+            version = meta["version"] if meta else 0
+            if version != self.version:
+                await self.load(db, version, session)
+
+    async def load(self, db, version: int, session=None):
+        courses = await db.courses.find({}, {"_id": 0}, session=session).to_list(None)
+        modules = await db.modules.find(
+            {}, {"_id": 0, "content": 0}, session=session
+        ).sort("order", 1).to_list(None)
+
+        modules_by_course: Dict[str, List[dict]] = {}
+        for module in modules:
+            modules_by_course.setdefault(module["course_id"], []).append(module)
+
+        self.courses = {course["id"]: course for course in courses}
+        self.modules = modules_by_course
+        self._module_slots = {
+            course_id: {module["id"]: completion.slot(module) for module in course_modules}
+            for course_id, course_modules in modules_by_course.items()
+        }
+        self._build_facets(courses)
+        self.version = version
+
+    def _build_facets(self, courses: List[dict]):
+        facet_masks: Dict[str, Dict[object, int]] = {field: {} for field in FACET_FIELDS}
+        for index, course in enumerate(courses):
+            for field in FACET_FIELDS:
+                value = course.get(field, False if field == "requires_terms" else None)
+                if value is not None:
+                    facet_masks[field][value] = facet_masks[field].get(value, 0) | 1 << index
+        self._course_list = courses
+        self._facet_masks = facet_masks
+        self._titles = sorted((course.get("title", "").lower(), index) for index, course in enumerate(courses))
+        self._search_cache = {}
+
+    def search(self, filters: Dict[str, Iterable], title_prefix: Optional[str] = None):
+        """Return (matching courses, {field: {value: count}}).
+
+        Values within a field are ORed, fields are ANDed. Each field's facet
+        counts ignore that field's own filter, so selecting one category still
+        shows how many courses the other categories would add.
+        """
+        prefix = (title_prefix or "").lower()
+        key = (
+            tuple(sorted((field, tuple(sorted(values, key=str))) for field, values in filters.items() if values)),
+            prefix,
+        )
+        cached = self._search_cache.get(key)
+        if cached is not None:
+            return cached
+
+        everything = (1 << len(self._course_list)) - 1
+        base = everything
+        if prefix:
+            lo = bisect_left(self._titles, (prefix,))
+            hi = bisect_left(self._titles, (prefix + "\uffff",))
+            base = 0
+            for _, index in self._titles[lo:hi]:
+                base |= 1 << index
+
+        field_masks = {}
+        for field, values in key[0]:
+            masks = self._facet_masks.get(field, {})
+            field_masks[field] = 0
+            for value in values:
+                field_masks[field] |= masks.get(value, 0)
+
+        matched = base
+        for mask in field_masks.values():
+            matched &= mask
+
+        facets = {}
+        for field in FACET_FIELDS:
+            scope = base
+            for other, mask in field_masks.items():
+                if other != field:
+                    scope &= mask
+            facets[field] = {value: _popcount(scope & mask) for value, mask in self._facet_masks[field].items()}
+
+        courses = [course for index, course in enumerate(self._course_list) if matched >> index & 1]
+        if len(self._search_cache) >= SEARCH_CACHE_SIZE:
+            self._search_cache.clear()
+        self._search_cache[key] = (courses, facets)
+        return courses, facets
+
+    def module_slot(self, course_id: str, module_id: str) -> Optional[int]:
+        """The module's completion bit (see completion.py)."""
+        return self._module_slots.get(course_id, {}).get(module_id)
+
+    def module_count(self, course_id: str) -> int:
+        return len(self.modules.get(course_id, ()))
@@ -0,0 +1,146 @@
+"""Diff-based sync of declarative course definitions into MongoDB.
+
+Definitions are a JSON document of courses, each with its `modules`
+embedded. They are flattened into the `courses` and `modules` collections
+the API reads (module bodies go to the content store). Every document is
+stamped with a `sync_hash` of its contents, so a sync only writes the
+documents that were added, changed or removed, and bumps the catalog version
+once if anything changed at all. Re-running an unchanged catalog writes
+nothing and leaves API caches alone.
+
+Each module also gets a `slot`: its completion bit in the bitset progress
+store (see completion.py). Unlike `order`, a slot is never changed or handed
+to another module, so reordering or inserting modules keeps learners'
+completions where they were. `db.catalog_meta` {"_id": "module_slots"}
+remembers the next free slot of every course, so removed modules' slots are
+not reused either.
+"""
+import hashlib
+import json
+from typing import Dict, Tuple
+
+from pymongo import DeleteMany, ReplaceOne
+
+import completion
+from catalog import bump_catalog_version
+from content_store import content_hash
+
+SYNC_HASH_FIELD = "sync_hash"
+SLOTS_META_ID = "module_slots"
+
+
+def _stamp(doc: dict) -> dict:
+    encoded = json.dumps(doc, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return {**doc, SYNC_HASH_FIELD: hashlib.sha256(encoded).hexdigest()}
+
+
+def build_documents(definitions: dict) -> Tuple[Dict[str, dict], Dict[str, dict], Dict[str, str]]:
+    """Flatten definitions into ({course_id: doc}, {module_id: doc}, {content_hash: content}).
+
+    Module documents are returned unstamped; `sync_catalog` stamps them once their slots are assigned.
+    """
+    courses, modules, contents = {}, {}, {}
+    for definition in definitions["courses"]:
+        course = {key: value for key, value in definition.items() if key != "modules"}
+        if course["id"] in courses:
+            raise ValueError(f"Duplicate course id: {course['id']}")
+        for module_definition in definition.get("modules", []):
+            module = {key: value for key, value in module_definition.items() if key != "content"}
+            if module["id"] in modules:
+                raise ValueError(f"Duplicate module id: {module['id']}")
+            content = module_definition.get("content", "")
+            module["course_id"] = course["id"]
+            module["content_hash"] = content_hash(content)
+            contents[module["content_hash"]] = content
+            modules[module["id"]] = module
+        course.setdefault("modules_count", len(definition.get("modules", [])))
+        courses[course["id"]] = _stamp(course)
+    return courses, modules, contents
+
+
+def assign_slots(modules: Dict[str, dict], existing: Dict[str, dict], next_slots: Dict[str, int]) -> Dict[str, int]:
+    """Give every module a slot; returns the courses' new next free slots.
+
+    Modules already stored in the same course keep theirs (modules synced
+    before slots existed keep their stored `order`, which their bits used);
+    new modules get fresh slots above anything the course ever had.
+    """
+    next_slots = dict(next_slots)
+    for doc in existing.values():
+        if doc.get("course_id") is not None and "order" in doc:
+            course_id = doc["course_id"]
+            next_slots[course_id] = max(next_slots.get(course_id, 0), completion.slot(doc) + 1)
+
+    for module_id, module in modules.items():
+        stored = existing.get(module_id)
+        if stored and stored.get("course_id") == module["course_id"] and "order" in stored:
+            module["slot"] = completion.slot(stored)
+        else:
+            module["slot"] = next_slots.get(module["course_id"], 0)
+            next_slots[module["course_id"]] = module["slot"] + 1
+    return next_slots
+
+
+def _plan(existing: Dict[str, dict], desired: Dict[str, dict]):
+    existing = {doc_id: doc.get(SYNC_HASH_FIELD) for doc_id, doc in existing.items()}
+    added = [doc_id for doc_id in desired if doc_id not in existing]
+    updated = [doc_id for doc_id in desired if doc_id in existing and existing[doc_id] != desired[doc_id][SYNC_HASH_FIELD]]
+    removed = [doc_id for doc_id in existing if doc_id not in desired]
+    return added, updated, removed
+
+
+async def sync_catalog(db, definitions: dict, content_store, dry_run: bool = False, prune: bool = True) -> dict:
+    courses, modules, contents = build_documents(definitions)
+    existing_courses = {
+        doc["id"]: doc for doc in await db.courses.find({}, {"_id": 0, "id": 1, SYNC_HASH_FIELD: 1}).to_list(None)
+    }
+    existing_modules = {
+        doc["id"]: doc
+        for doc in await db.modules.find(
+            {}, {"_id": 0, "id": 1, "course_id": 1, "order": 1, "slot": 1, SYNC_HASH_FIELD: 1}
+        ).to_list(None)
+    }
+    slots_meta = await db.catalog_meta.find_one({"_id": SLOTS_META_ID}) or {}
+    next_slots = assign_slots(modules, existing_modules, slots_meta.get("next", {}))
+    modules = {module_id: _stamp(module) for module_id, module in modules.items()}
+
+    course_plan = _plan(existing_courses, courses)
+    module_plan = _plan(existing_modules, modules)
+    if not prune:
+        course_plan, module_plan = (*course_plan[:2], []), (*module_plan[:2], [])
+
+    summary = {
+        name: {"added": len(added), "updated": len(updated), "removed": len(removed),
+               "unchanged": len(desired) - len(added) - len(updated)}
+        for name, desired, (added, updated, removed) in (
+            ("courses", courses, course_plan), ("modules", modules, module_plan)
+        )
+    }
+    changed = any(course_plan) or any(module_plan)
+    if dry_run or not changed:
+        summary["version"] = None
+        return summary
+
+    # Reserve the slots before any module uses them, so a removed module's slot is never reissued
+    if next_slots:
+        await db.catalog_meta.update_one(
+            {"_id": SLOTS_META_ID},
+            {"$max": {f"next.{course_id}": next_slot for course_id, next_slot in next_slots.items()}},
+            upsert=True
+        )
+
+    # Bodies first, so no module ever points at a blob that does not exist yet
+    for module_id in [*module_plan[0], *module_plan[1]]:
+        await content_store.put(contents[modules[module_id]["content_hash"]])
+
+    for collection, desired, (added, updated, removed) in (
+        (db.courses, courses, course_plan), (db.modules, modules, module_plan)
+    ):
+        operations = [ReplaceOne({"id": doc_id}, desired[doc_id], upsert=True) for doc_id in [*added, *updated]]
+        if removed:
+            operations.append(DeleteMany({"id": {"$in": removed}}))
+        if operations:
+            await collection.bulk_write(operations, ordered=False)
+
+    summary["version"] = await bump_catalog_version(db)
+    return summary
@@ -0,0 +1,95 @@
+"""Compact module completion stored on the enrollment document.
+
+Instead of one `progress` document per module, an enrollment can carry
+
+    completion_bits:  {"<word>": int}   # bit (slot % 32) of word (slot // 32)
+    completion_times: {"<slot>": iso}   # completed_at of each set bit
+
+Both maps are updated in place with `$bit` / `$set` / `$unset`, so marking a
+module is a single atomic write and reading a course's progress is a single
+enrollment fetch. Missing words read as zero.
+
+Bits are keyed by the module's `slot`, which the catalog sync assigns once
+and never changes or reuses, so reordering or inserting modules cannot move
+completions onto other modules. Modules synced before slots existed use
+their `order`, which is what their bits were written with.
+"""
+from typing import Dict, Iterable, List
+
+WORD_BITS = 32
+WORD_MASK = (1 << WORD_BITS) - 1
+
+# Fields kept on the enrollment for the bitset store; never part of API payloads
+INTERNAL_FIELDS = ("completion_bits", "completion_times")
+
+
+def slot(module: dict) -> int:
+    return module.get("slot", module["order"])
+
+
+def completion_update(slot: int, completed: bool, timestamp: str) -> dict:
+    """Update document flipping the bit for module `slot` (MongoDB stamps `updated_at`)."""
+    word, bit = divmod(slot, WORD_BITS)
+    field = f"completion_bits.{word}"
+    if completed:
+        return {
+            "$bit": {field: {"or": 1 << bit}},
+            "$set": {f"completion_times.{slot}": timestamp},
+            "$currentDate": {"updated_at": True},
+        }
+    return {
+        "$bit": {field: {"and": WORD_MASK & ~(1 << bit)}},
+        "$unset": {f"completion_times.{slot}": ""},
+        "$currentDate": {"updated_at": True},
+    }
+
+
+def is_completed(bits: Dict[str, int], slot: int) -> bool:
+    word, bit = divmod(slot, WORD_BITS)
+    return bool(int(bits.get(str(word), 0)) >> bit & 1)
+
+
+def pack(slots_to_times: Dict[int, str]) -> dict:
+    """Build `completion_bits` / `completion_times` for a set of completed slots."""
+    bits: Dict[str, int] = {}
+    for completed_slot in slots_to_times:
+        word, bit = divmod(completed_slot, WORD_BITS)
+        bits[str(word)] = bits.get(str(word), 0) | 1 << bit
+    return {
+        "completion_bits": bits,
+        "completion_times": {str(completed_slot): timestamp for completed_slot, timestamp in slots_to_times.items()},
+    }
+
+
+def completed_count(enrollment: dict, modules: Iterable[dict]) -> int:
+    bits = enrollment.get("completion_bits") or {}
+    return sum(1 for module in modules if is_completed(bits, slot(module)))
+
+
+def expand(enrollment: dict, modules: Iterable[dict], include_incomplete: bool = False) -> List[dict]:
+    """Render the bitset as the progress records the document store would return.
+
+    With `include_incomplete`, modules that are not completed are rendered
+    too (completed=False), so a sync client also learns about un-completions.
+    """
+    bits = enrollment.get("completion_bits") or {}
+    times = enrollment.get("completion_times") or {}
+    records = []
+    for module in modules:
+        completed = is_completed(bits, slot(module))
+        if not completed and not include_incomplete:
+            continue
+        records.append({
+            "id": f"{enrollment['user_id']}:{module['id']}",
+            "user_id": enrollment["user_id"],
+            "module_id": module["id"],
+            "course_id": enrollment["course_id"],
+            "completed": completed,
+            "completed_at": times.get(str(slot(module))) if completed else None,
+        })
+    return records
+
+
+def public(enrollment: dict) -> dict:
+    """The enrollment without its bitset fields."""
+    return {key: value for key, value in enrollment.items() if key not in INTERNAL_FIELDS}
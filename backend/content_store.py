@@ -0,0 +1,123 @@
+"""Content-addressed, compressed storage for module bodies.
+
+Module documents keep a `content_hash` (sha256 of the UTF-8 text) instead
+of the inline `content`; the compressed bytes live once per distinct body in
+`db.module_contents` {"_id": hash, "codec", "data", "size"}. Because a hash
+never changes meaning, each API node caches decompressed bodies on local
+disk forever and reads them back through mmap, so repeat reads are served
+from the page cache and never go back to MongoDB.
+
+zstd is used when the optional `zstandard` package is installed, gzip
+otherwise; the codec is recorded per blob so both can coexist.
+
+Blob reads may go to a lagging secondary, which can miss a blob the catalog
+already points at; misses are retried on the `primary` collection when one
+is given. Disk cache I/O runs in a worker thread, off the event loop.
+"""
+import asyncio
+import gzip
+import hashlib
+import logging
+import mmap
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from bson import Binary
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def compress(data: bytes):
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=10).compress(data)
+    return "gzip", gzip.compress(data, compresslevel=9)
+
+
+def decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd-compressed content requires the zstandard package")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "gzip":
+        return gzip.decompress(data)
+    raise ValueError(f"Unknown content codec: {codec}")
+
+
+class ContentStore:
+    def __init__(self, collection, cache_dir, primary=None):
+        self.collection = collection
+        self.primary = primary
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    async def put(self, text: str) -> str:
+        digest = content_hash(text)
+        data = text.encode("utf-8")
+        codec, blob = compress(data)
+        await self.collection.update_one(
+            {"_id": digest},
+            {"$setOnInsert": {"codec": codec, "data": Binary(blob), "size": len(data)}},
+            upsert=True
+        )
+        await asyncio.to_thread(self._write_cache, digest, data)
+        return digest
+
+    async def get_many(self, hashes: Iterable[str]) -> Dict[str, str]:
+        """Bodies by hash; hashes found in neither the cache nor MongoDB are logged and left out."""
+        result = await asyncio.to_thread(self._read_cache_many, set(hashes))
+        missing = [digest for digest, text in result.items() if text is None]
+        for collection in (self.collection, self.primary):
+            if not missing or collection is None:
+                continue
+            fetched = {}
+            async for blob in collection.find({"_id": {"$in": missing}}):
+                fetched[blob["_id"]] = decompress(blob["codec"], bytes(blob["data"]))
+            await asyncio.to_thread(self._write_cache_many, fetched)
+            result.update((digest, data.decode("utf-8")) for digest, data in fetched.items())
+            missing = [digest for digest in missing if digest not in fetched]
+
+        if missing:
+            logger.error("Module content missing from the content store: %s", ", ".join(sorted(missing)))
+        return {digest: text for digest, text in result.items() if text is not None}
+
+    def _path(self, digest: str) -> Path:
+        return self.cache_dir / digest[:2] / digest
+
+    def _read_cache_many(self, digests: Iterable[str]) -> Dict[str, Optional[str]]:
+        return {digest: self._read_cache(digest) for digest in digests}
+
+    def _write_cache_many(self, blobs: Dict[str, bytes]):
+        for digest, data in blobs.items():
+            self._write_cache(digest, data)
+
+    def _read_cache(self, digest: str) -> Optional[str]:
+        try:
+            with open(self._path(digest), "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return ""
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return mapped[:].decode("utf-8")
+        except FileNotFoundError:
+            return None
+
+    def _write_cache(self, digest: str, data: bytes):
+        path = self._path(digest)
+        if path.exists():
+            return
+        path.parent.mkdir(exist_ok=True)
+        # Write-then-rename so concurrent readers never see a partial file
+        fd, tmp = tempfile.mkstemp(dir=path.parent)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
@@ -0,0 +1,83 @@
+"""Unique (user_id, course_id) enrollments.
+
+Older deployments enrolled with check-then-insert, which could race into
+duplicate enrollments, and indexed (user_id, course_id) without `unique`
+under the same default name. `ensure_unique_index` swaps that index for the
+unique one; the build fails while duplicates remain, which `dedupe` (run by
+scripts/dedupe_enrollments.py) resolves by folding each group into its
+oldest enrollment.
+"""
+import logging
+from typing import List, Tuple
+
+from pymongo.errors import OperationFailure
+
+ENROLLMENT_KEY = [("user_id", 1), ("course_id", 1)]
+
+logger = logging.getLogger(__name__)
+
+
+async def ensure_unique_index(db) -> bool:
+    """Build the unique enrollment index, dropping a non-unique one on the same keys first.
+
+    Returns False (and logs) instead of raising when duplicates block the
+    build, so a not-yet-migrated database does not stop the API starting.
+    """
+    for name, spec in (await db.enrollments.index_information()).items():
+        if [tuple(key) for key in spec["key"]] == ENROLLMENT_KEY and not spec.get("unique"):
+            try:
+                await db.enrollments.drop_index(name)
+            except OperationFailure:
+                pass  # another instance dropped it first
+    try:
+        await db.enrollments.create_index(ENROLLMENT_KEY, unique=True)
+    except OperationFailure as e:
+        logger.error("Unique enrollment index not built; run scripts/dedupe_enrollments.py (%s)", e)
+        return False
+    return True
+
+
+def merge(docs: List[dict]) -> Tuple[dict, dict, list]:
+    """Fold duplicate enrollments into the oldest: (keeper, $set for it, _ids to delete)."""
+    docs = sorted(docs, key=lambda doc: (doc.get("enrolled_at") or "", str(doc["_id"])))
+    keeper, duplicates = docs[0], docs[1:]
+
+    bits = dict(keeper.get("completion_bits") or {})
+    times = dict(keeper.get("completion_times") or {})
+    progress = float(keeper.get("progress", 0.0))
+    for doc in duplicates:
+        progress = max(progress, float(doc.get("progress", 0.0)))
+        for word, value in (doc.get("completion_bits") or {}).items():
+            bits[word] = int(bits.get(word, 0)) | int(value)
+        for slot, completed_at in (doc.get("completion_times") or {}).items():
+            if slot not in times or (completed_at and completed_at < times[slot]):
+                times[slot] = completed_at
+
+    update = {"progress": progress}
+    if bits:
+        update["completion_bits"] = bits
+        update["completion_times"] = times
+    return keeper, update, [doc["_id"] for doc in duplicates]
+
+
+async def dedupe(db, dry_run: bool = False) -> dict:
+    groups = db.enrollments.aggregate([
+        {"$group": {
+            "_id": {"user_id": "$user_id", "course_id": "$course_id"},
+            "ids": {"$push": "$_id"},
+            "count": {"$sum": 1},
+        }},
+        {"$match": {"count": {"$gt": 1}}},
+    ], allowDiskUse=True)
+
+    merged = removed = 0
+    async for group in groups:
+        docs = await db.enrollments.find({"_id": {"$in": group["ids"]}}).to_list(None)
+        keeper, update, duplicate_ids = merge(docs)
+        merged += 1
+        removed += len(duplicate_ids)
+        if dry_run:
+            continue
+        await db.enrollments.update_one({"_id": keeper["_id"]}, {"$set": update, "$currentDate": {"updated_at": True}})
+        await db.enrollments.delete_many({"_id": {"$in": duplicate_ids}})
+    return {"groups": merged, "removed": removed}
@@ -0,0 +1,157 @@
+"""Streaming export of learner data as NDJSON or CSV.
+
+Rows come straight off a Motor cursor in `_id` order, one batch at a time,
+so memory stays constant however large the export is. Every row carries a
+`cursor` column; passing the last one received back as `cursor=` resumes
+the export right after that row.
+"""
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional
+
+from bson import ObjectId
+
+import completion
+
+EXPORT_FIELDS = {
+    "users": ["id", "username", "email", "streak_count", "last_login_date", "created_at"],
+    "enrollments": ["id", "user_id", "course_id", "progress", "enrolled_at", "updated_at"],
+    "progress": ["id", "user_id", "course_id", "module_id", "completed", "completed_at"],
+}
+# Field the since/until range applies to
+DATE_FIELDS = {"users": "created_at", "enrollments": "enrolled_at", "progress": "completed_at"}
+FORMATS = ("ndjson", "csv")
+
+
+class ExportError(ValueError):
+    pass
+
+
+def validate(kind: str, fmt: str, cursor: Optional[str] = None):
+    """Check export arguments up front, before any response has been started."""
+    if kind not in EXPORT_FIELDS:
+        raise ExportError(f"Unknown export kind: {kind}")
+    if fmt not in FORMATS:
+        raise ExportError(f"Unknown export format: {fmt}")
+    if cursor and not ObjectId.is_valid(cursor):
+        raise ExportError("Invalid export cursor")
+
+
+def _value(value):
+    # MongoDB-stamped fields (`updated_at`) come back as naive UTC datetimes
+    if isinstance(value, datetime):
+        return (value if value.tzinfo else value.replace(tzinfo=timezone.utc)).isoformat()
+    return value
+
+
+def _range(since: Optional[str], until: Optional[str]) -> dict:
+    bounds = {}
+    if since:
+        bounds["$gte"] = since
+    if until:
+        bounds["$lt"] = until
+    return bounds
+
+
+async def export_rows(
+    db,
+    kind: str,
+    course_id: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    batch_size: int = 1000,
+    cursor: Optional[str] = None,
+    modules_by_course: Optional[Dict[str, List[dict]]] = None,
+) -> AsyncIterator[List[dict]]:
+    """Yield batches of export rows, each row tagged with its resume `cursor`.
+
+    Arguments are expected to have passed `validate`.
+
+    When `modules_by_course` is given, progress is read from enrollment
+    completion bitsets instead of the progress collection.
+    """
+    query = {}
+    if cursor:
+        query["_id"] = {"$gt": ObjectId(cursor)}
+    bounds = _range(since, until)
+
+    # Users of a course and bitset progress are both driven by the enrollments of that course
+    via_enrollments = (kind == "users" and course_id) or (kind == "progress" and modules_by_course is not None)
+    if via_enrollments:
+        source = db.enrollments
+        if course_id:
+            query["course_id"] = course_id
+        if kind == "progress":
+            query["completion_bits"] = {"$exists": True}
+            projection = {"user_id": 1, "course_id": 1, "completion_bits": 1, "completion_times": 1}
+        else:
+            projection = {"user_id": 1}
+    else:
+        source = getattr(db, kind)
+        if course_id:
+            query["course_id"] = course_id
+        if bounds:
+            query[DATE_FIELDS[kind]] = bounds
+        projection = {field: 1 for field in EXPORT_FIELDS[kind]}
+
+    batch = []
+    async for doc in source.find(query, projection).sort("_id", 1).batch_size(batch_size):
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            yield await _rows(db, kind, batch, via_enrollments, bounds, modules_by_course)
+            batch = []
+    if batch:
+        yield await _rows(db, kind, batch, via_enrollments, bounds, modules_by_course)
+
+
+async def _rows(db, kind, docs, via_enrollments, bounds, modules_by_course) -> List[dict]:
+    fields = EXPORT_FIELDS[kind]
+    if not via_enrollments:
+        return [{**{field: _value(doc.get(field)) for field in fields}, "cursor": str(doc["_id"])} for doc in docs]
+
+    if kind == "progress":
+        rows = []
+        for doc in docs:
+            for record in completion.expand(doc, modules_by_course.get(doc["course_id"], [])):
+                if bounds and not _in_range(record["completed_at"], bounds):
+                    continue
+                rows.append({**{field: record.get(field) for field in fields}, "cursor": str(doc["_id"])})
+        return rows
+
+    user_query = {"id": {"$in": [doc["user_id"] for doc in docs]}}
+    if bounds:
+        user_query[DATE_FIELDS["users"]] = bounds
+    users = await db.users.find(user_query, {"_id": 0, **{field: 1 for field in fields}}).to_list(None)
+    users_by_id = {user["id"]: user for user in users}
+    return [
+        {**{field: users_by_id[doc["user_id"]].get(field) for field in fields}, "cursor": str(doc["_id"])}
+        for doc in docs
+        if doc["user_id"] in users_by_id
+    ]
+
+
+def _in_range(value: Optional[str], bounds: dict) -> bool:
+    if value is None:
+        return False
+    return value >= bounds.get("$gte", value) and ("$lt" not in bounds or value < bounds["$lt"])
+
+
+async def export_text(batches: AsyncIterator[List[dict]], kind: str, fmt: str) -> AsyncIterator[str]:
+    """Render row batches as NDJSON lines or CSV (with a header row)."""
+    columns = EXPORT_FIELDS[kind] + ["cursor"]
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=columns)
+        writer.writeheader()
+        yield buffer.getvalue()
+
+    async for rows in batches:
+        if fmt == "ndjson":
+            yield "".join(json.dumps(row) + "\n" for row in rows)
+        else:
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=columns)
+            writer.writerows(rows)
+            yield buffer.getvalue()
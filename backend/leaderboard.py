@@ -0,0 +1,100 @@
+"""In-memory streak leaderboard.
+
+A streak is only alive while the user's `last_login_date` is today or
+yesterday, so the leaderboard keeps one bucket per live login date. When
+the UTC day rolls over the stale bucket is dropped wholesale instead of
+re-checking dates on every request.
+"""
+from bisect import bisect_left, insort
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def live_streak(streak_count: int, last_login_date: Optional[str], today: date) -> int:
+    """The stored streak if it is still alive today, otherwise 0."""
+    if last_login_date in (today.isoformat(), (today - timedelta(days=1)).isoformat()):
+        return streak_count
+    return 0
+
+
+class StreakLeaderboard:
+    def __init__(self):
+        # login date -> {user_id: (streak_count, username)}
+        self._buckets: Dict[str, Dict[str, Tuple[int, str]]] = {}
+        # Live entries ordered by (-streak_count, user_id); rank lookups bisect it
+        self._ranked: List[Tuple[int, str]] = []
+        self._entries: Dict[str, Tuple[int, str, str]] = {}
+        self._today: Optional[date] = None
+
+    def load(self, users: Iterable[dict], today: date):
+        self._buckets = {}
+        self._entries = {}
+        self._today = today
+        live = {today.isoformat(), (today - timedelta(days=1)).isoformat()}
+        for user in users:
+            login_date = user.get("last_login_date")
+            if login_date not in live:
+                continue
+            self._put(user["id"], int(user.get("streak_count", 0)), user.get("username", ""), login_date)
+        self._ranked = sorted((-streak, user_id) for user_id, (streak, _, _) in self._entries.items())
+
+    def update(self, user_id: str, streak_count: int, username: str, login_date: str, today: date):
+        self._roll(today)
+        self._discard(user_id)
+        self._put(user_id, streak_count, username, login_date)
+        insort(self._ranked, (-streak_count, user_id))
+
+    def rename(self, user_id: str, username: str):
+        entry = self._entries.get(user_id)
+        if entry:
+            streak, _, login_date = entry
+            self._entries[user_id] = (streak, username, login_date)
+            self._buckets[login_date][user_id] = (streak, username)
+
+    def top(self, limit: int, today: date) -> List[dict]:
+        self._roll(today)
+        result = []
+        for position, (neg_streak, user_id) in enumerate(self._ranked[:limit]):
+            streak, username, _ = self._entries[user_id]
+            # Ties share the rank of the first entry with the same streak
+            rank = position + 1 if position == 0 or self._ranked[position - 1][0] != neg_streak \
+                else result[-1]["rank"]
+            result.append({"rank": rank, "username": username, "streak_count": streak})
+        return result
+
+    def rank(self, user_id: str, today: date) -> Optional[int]:
+        self._roll(today)
+        entry = self._entries.get(user_id)
+        if not entry:
+            return None
+        return bisect_left(self._ranked, (-entry[0], "")) + 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _put(self, user_id, streak_count, username, login_date):
+        self._buckets.setdefault(login_date, {})[user_id] = (streak_count, username)
+        self._entries[user_id] = (streak_count, username, login_date)
+
+    def _discard(self, user_id):
+        entry = self._entries.pop(user_id, None)
+        if not entry:
+            return
+        streak, _, login_date = entry
+        self._buckets[login_date].pop(user_id, None)
+        index = bisect_left(self._ranked, (-streak, user_id))
+        if index < len(self._ranked) and self._ranked[index] == (-streak, user_id):
+            del self._ranked[index]
+
+    def _roll(self, today: date):
+        if self._today == today:
+            return
+        self._today = today
+        live = {today.isoformat(), (today - timedelta(days=1)).isoformat()}
+        expired = [login_date for login_date in self._buckets if login_date not in live]
+        if not expired:
+            return
+        for login_date in expired:
+            for user_id in self._buckets.pop(login_date):
+                self._entries.pop(user_id, None)
+        self._ranked = [item for item in self._ranked if item[1] in self._entries]
@@ -0,0 +1,135 @@
+"""Opt-in sampling profiler for individual API requests.
+
+The middleware is only installed when profiling is configured, so a normal
+deployment pays nothing. A profiled request gets a sampler thread that
+records, every few milliseconds, the logical stack of the request's asyncio
+task: the frames actually executing on the event loop when the task is
+running, or the chain of awaited coroutines when it is suspended (so time
+spent waiting on MongoDB shows up under the await that caused it).
+
+Each sample is weighted by the wall time since the previous one. While the
+handler runs CPU-bound Python the sampler thread waits for the GIL and wakes
+late, so counting samples would undercount CPU work; the measured gap does
+not. Profiles are written in collapsed-stack format (`frame;frame;frame
+weight`, the weight in microseconds), which speedscope and flamegraph.pl
+both import directly.
+"""
+import asyncio
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import List, Optional
+
+
+def _label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class _TaskSampler(threading.Thread):
+    def __init__(self, task: asyncio.Task, loop_thread_id: int, interval: float):
+        super().__init__(name="request-profiler", daemon=True)
+        self.task = task
+        self.loop_thread_id = loop_thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        previous = time.perf_counter()
+        while not self._stop_event.wait(self.interval):
+            stack = self._sample()
+            now = time.perf_counter()
+            if stack:
+                self.samples[";".join(stack)] += round((now - previous) * 1_000_000)
+            previous = now
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def _sample(self) -> Optional[List[str]]:
+        coro = self.task.get_coro()
+        root = getattr(coro, "cr_frame", None)
+        if root is None:
+            return None
+
+        if coro.cr_running:
+            # Running on the loop thread: walk real frames up to the task's root coroutine
+            frame = sys._current_frames().get(self.loop_thread_id)
+            stack = []
+            while frame is not None:
+                if frame.f_code is _TaskSampler.stop.__code__:
+                    return None  # the request is over; the loop is waiting for this thread
+                stack.append(_label(frame))
+                if frame is root:
+                    return stack[::-1]
+                frame = frame.f_back
+            return None
+
+        # Suspended: follow the await chain down to whatever it is waiting on
+        stack = []
+        while coro is not None:
+            frame = getattr(coro, "cr_frame", None) or getattr(coro, "ag_frame", None)
+            if frame is None:
+                stack.append(f"[await {type(coro).__name__}]")
+                break
+            stack.append(_label(frame))
+            coro = getattr(coro, "cr_await", None) or getattr(coro, "ag_await", None)
+        return stack
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware, so the handler runs in the same task we sample."""
+
+    def __init__(self, app, output_dir: str, sample_rate: float = 0.0, token: str = "",
+                 header: str = "x-profile", interval: float = 0.002, max_profiles: int = 200):
+        self.app = app
+        self.output_dir = Path(output_dir)
+        self.sample_rate = sample_rate
+        self.token = token
+        self.header = header.lower().encode()
+        self.interval = interval
+        self.max_profiles = max_profiles
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        sampler = _TaskSampler(asyncio.current_task(), threading.get_ident(), self.interval)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            sampler.stop()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            await asyncio.to_thread(self._write, scope, sampler.samples, elapsed_ms)
+
+    def _should_profile(self, scope) -> bool:
+        if self.token:
+            for name, value in scope.get("headers", ()):
+                if name == self.header:
+                    return hmac.compare_digest(value, self.token.encode())
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _write(self, scope, samples: Counter, elapsed_ms: float):
+        if not samples:
+            return
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_") or "root"
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{time.time_ns() % 1_000_000:06d}-{scope['method']}-{slug}-{elapsed_ms:.0f}ms.collapsed"
+        with open(self.output_dir / name, "w") as f:
+            for stack, weight in samples.most_common():
+                f.write(f"{stack} {weight}\n")
+
+        profiles = sorted(self.output_dir.glob("*.collapsed"), key=lambda path: path.stat().st_mtime)
+        for stale in profiles[:-self.max_profiles]:
+            stale.unlink(missing_ok=True)
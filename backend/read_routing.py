@@ -0,0 +1,28 @@
+"""Read preferences for each class of read traffic.
+
+User-facing reads (auth, enrollments, progress, profile) stay on the
+primary, so a request always sees the writes made before it. Catalog and
+analytics reads tolerate bounded staleness and can be sent to secondaries
+through their own database handles. On a standalone server or a single-host
+replica set every mode ends up reading from the one node.
+"""
+from pymongo.read_preferences import ReadPreference, make_read_preference, read_pref_mode_from_name
+
+# MongoDB rejects a smaller maxStalenessSeconds
+MIN_MAX_STALENESS_SECONDS = 90
+MODES = ("primary", "primaryPreferred", "secondary", "secondaryPreferred", "nearest")
+
+
+def read_preference(mode: str, max_staleness: int = -1):
+    """Build a read preference from its name; -1 means no staleness bound."""
+    if mode not in MODES:
+        raise ValueError(f"Unknown read preference {mode!r}; expected one of {', '.join(MODES)}")
+    if mode == "primary":
+        return ReadPreference.PRIMARY
+    if max_staleness != -1 and max_staleness < MIN_MAX_STALENESS_SECONDS:
+        raise ValueError(f"max staleness must be -1 or at least {MIN_MAX_STALENESS_SECONDS} seconds")
+    return make_read_preference(read_pref_mode_from_name(mode), None, max_staleness)
+
+
+def routed_database(client, name: str, mode: str, max_staleness: int = -1):
+    return client.get_database(name, read_preference=read_preference(mode, max_staleness))
@@ -0,0 +1,100 @@
+"""Item-item course recommendations from co-enrollment.
+
+Enrollments form a sparse user x course matrix (weighted by how far the
+learner got). Course similarity is the cosine of the columns, computed with
+blocked dense matrix products so memory stays bounded by the block size.
+"""
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+DEFAULT_TOP_N = 10
+BLOCK_SIZE = 8192
+
+
+def build_neighbor_table(
+    user_ids: Sequence[str],
+    course_ids: Sequence[str],
+    weights: Sequence[float],
+    top_n: int = DEFAULT_TOP_N,
+    block_size: int = BLOCK_SIZE,
+) -> Tuple[Dict[str, List[Tuple[str, float]]], Dict[str, int]]:
+    """Return ({course_id: [(neighbor_id, score), ...]}, {course_id: enrollments})."""
+    # Only the background refresh needs numpy; keep it off the API's import path
+    import numpy as np
+
+    if len(user_ids) == 0:
+        return {}, {}
+
+    _, rows = np.unique(np.asarray(user_ids, dtype=str), return_inverse=True)
+    courses, cols = np.unique(np.asarray(course_ids, dtype=str), return_inverse=True)
+    values = np.asarray(weights, dtype=np.float32)
+    n_courses = len(courses)
+
+    # Sort by user so each block of users is a contiguous slice of the entries
+    order = np.argsort(rows, kind="stable")
+    rows, cols, values = rows[order], cols[order], values[order]
+    n_users = int(rows[-1]) + 1
+
+    co_occurrence = np.zeros((n_courses, n_courses), dtype=np.float64)
+    starts = np.arange(0, n_users, block_size)
+    bounds = np.searchsorted(rows, np.append(starts, n_users))
+    for block, start in enumerate(starts):
+        lo, hi = bounds[block], bounds[block + 1]
+        if lo == hi:
+            continue
+        dense = np.zeros((min(block_size, n_users - start), n_courses), dtype=np.float32)
+        dense[rows[lo:hi] - start, cols[lo:hi]] = values[lo:hi]
+        co_occurrence += dense.T @ dense
+
+    norms = np.sqrt(np.diag(co_occurrence))
+    norms[norms == 0] = 1.0
+    similarity = co_occurrence / np.outer(norms, norms)
+    np.fill_diagonal(similarity, 0.0)
+
+    k = min(top_n, n_courses - 1)
+    neighbors: Dict[str, List[Tuple[str, float]]] = {}
+    if k > 0:
+        candidates = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+        scores = np.take_along_axis(similarity, candidates, axis=1)
+        ranked = np.argsort(-scores, axis=1)
+        candidates = np.take_along_axis(candidates, ranked, axis=1)
+        scores = np.take_along_axis(scores, ranked, axis=1)
+        for i, course_id in enumerate(courses):
+            neighbors[str(course_id)] = [
+                (str(courses[j]), float(score))
+                for j, score in zip(candidates[i], scores[i])
+                if score > 0
+            ]
+
+    popularity = np.bincount(cols, minlength=n_courses)
+    return neighbors, {str(course_id): int(count) for course_id, count in zip(courses, popularity)}
+
+
+class RecommendationTable:
+    """Precomputed neighbors served to the API; swapped atomically on refresh."""
+
+    def __init__(self):
+        self.neighbors: Dict[str, List[Tuple[str, float]]] = {}
+        self.popularity: Dict[str, int] = {}
+        self.computed_at = None
+
+    def replace(self, neighbors, popularity, computed_at):
+        self.neighbors, self.popularity, self.computed_at = neighbors, popularity, computed_at
+
+    def recommend(self, enrolled: Iterable[str], limit: int) -> List[Tuple[str, float]]:
+        enrolled = set(enrolled)
+        scores: Dict[str, float] = {}
+        for course_id in enrolled:
+            for neighbor_id, score in self.neighbors.get(course_id, ()):
+                if neighbor_id not in enrolled:
+                    scores[neighbor_id] = scores.get(neighbor_id, 0.0) + score
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+        # Cold start (or nothing co-enrolled yet): fall back to the most popular courses
+        if len(ranked) < limit:
+            seen = enrolled | {course_id for course_id, _ in ranked}
+            popular = sorted(
+                (item for item in self.popularity.items() if item[0] not in seen),
+                key=lambda item: item[1], reverse=True
+            )
+            ranked.extend((course_id, 0.0) for course_id, _ in popular[:limit - len(ranked)])
+        return ranked
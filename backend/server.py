@@ -1,26 +1,62 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
+import time
+_IMPORT_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query, status
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
+from bson import ObjectId
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReplaceOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 import os
+import asyncio
+import functools
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 import uuid
+import base64
+import json
 from datetime import datetime, timezone, timedelta, date
 from passlib.context import CryptContext
 import jwt
 
+import activity
+import completion
+from catalog import Catalog
+from content_store import ContentStore
+from enrollment_dedupe import ensure_unique_index as ensure_unique_enrollment_index
+from export import ExportError, export_rows, export_text, validate as validate_export
+from leaderboard import StreakLeaderboard, live_streak
+from profiling import ProfilingMiddleware
+from read_routing import routed_database
+from recommendations import RecommendationTable, build_neighbor_table
+
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+# Connections the startup warm-up opens (and the driver keeps open) before taking traffic
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', 5))
+client = AsyncIOMotorClient(mongo_url, minPoolSize=MONGO_MIN_POOL_SIZE)
 db = client[os.environ['DB_NAME']]
 
+# Catalog and analytics reads tolerate bounded staleness, so they may be served by secondaries;
+# everything read through `db` (users, enrollments, progress) stays on the primary
+READ_MAX_STALENESS_SECONDS = int(os.environ.get('READ_MAX_STALENESS_SECONDS', 90))
+catalog_db = routed_database(
+    client, os.environ['DB_NAME'], os.environ.get('CATALOG_READ_PREFERENCE', 'secondaryPreferred'),
+    READ_MAX_STALENESS_SECONDS
+)
+analytics_db = routed_database(
+    client, os.environ['DB_NAME'], os.environ.get('ANALYTICS_READ_PREFERENCE', 'secondaryPreferred'),
+    READ_MAX_STALENESS_SECONDS
+)
+
 # Create the main app
 app = FastAPI()
 api_router = APIRouter(prefix="/api")
@@ -32,6 +68,32 @@ SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'dexnote-secret-key-change-in-prod
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
+# Courses and module metadata, reloaded when the catalog version changes
+catalog = Catalog(refresh_seconds=float(os.environ.get('CATALOG_REFRESH_SECONDS', 30)))
+
+# Module bodies, content-addressed in db.module_contents with a local disk cache;
+# blobs a lagging secondary does not have yet are read from the primary
+content_store = ContentStore(
+    catalog_db.module_contents, os.environ.get('CONTENT_CACHE_DIR', str(ROOT_DIR / 'content_cache')),
+    primary=db.module_contents
+)
+
+# "documents": one db.progress document per module (default)
+# "bitset": completion bitset on the enrollment (see completion.py and scripts/migrate_progress_bitsets.py)
+PROGRESS_STORE = os.environ.get('PROGRESS_STORE', 'documents')
+
+# Live streaks, rebuilt from db.users on startup and every LEADERBOARD_REFRESH_SECONDS
+# (so logins handled by other instances show up), and kept current by this instance's logins
+streak_leaderboard = StreakLeaderboard()
+LEADERBOARD_REFRESH_SECONDS = int(os.environ.get('LEADERBOARD_REFRESH_SECONDS', 60))
+
+# Co-enrollment neighbors, refreshed in the background
+course_recommendations = RecommendationTable()
+RECOMMENDATIONS_REFRESH_SECONDS = int(os.environ.get('RECOMMENDATIONS_REFRESH_SECONDS', 3600))
+
+# Identifies this process as the holder of background job leases (db.job_leases)
+INSTANCE_ID = str(uuid.uuid4())
+
 # ============= MODELS =============
 class UserSignup(BaseModel):
     username: str
@@ -49,6 +111,7 @@ class User(BaseModel):
     email: EmailStr
     streak_count: int = 0
     last_login_date: Optional[str] = None
+    role: str = "learner"  # "learner", "instructor" or "admin"
     created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
 
 class UserResponse(BaseModel):
@@ -68,6 +131,11 @@ class Course(BaseModel):
     requires_terms: bool = False  # For courses requiring T&C acceptance
     created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
 
+class CourseSearchResponse(BaseModel):
+    courses: List[Course]
+    facets: Dict[str, Dict[str, int]]  # field -> value -> matching courses
+    catalog_version: int
+
 class Module(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -75,6 +143,7 @@ class Module(BaseModel):
     title: str
     content: str
     order: int
+    content_hash: Optional[str] = None
     created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
 
 class Enrollment(BaseModel):
@@ -84,6 +153,7 @@ class Enrollment(BaseModel):
     course_id: str
     progress: float = 0.0  # percentage 0-100
     enrolled_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    updated_at: Optional[datetime] = None  # stamped by MongoDB ($currentDate) on every write
 
 class Progress(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -93,6 +163,7 @@ class Progress(BaseModel):
     course_id: str
     completed: bool = False
     completed_at: Optional[str] = None
+    updated_at: Optional[datetime] = None  # stamped by MongoDB ($currentDate) on every write
 
 class EnrollmentRequest(BaseModel):
     course_id: str
@@ -103,11 +174,21 @@ class ProgressUpdate(BaseModel):
     course_id: str
     completed: bool
 
+class BulkEnrollmentRequest(BaseModel):
+    user_ids: List[str] = []
+    emails: List[EmailStr] = []
+    course_ids: List[str]
+    terms_accepted: bool = False  # Accepted on the cohort's behalf for courses requiring T&C
+
 class ProfileUpdate(BaseModel):
     username: Optional[str] = None
     email: Optional[EmailStr] = None
 
 # ============= HELPER FUNCTIONS =============
+def _utc_now_iso() -> str:
+    # Fixed-width timestamps so stored ISO strings sort lexicographically
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -138,6 +219,11 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     except jwt.JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+async def get_current_staff(current_user: User = Depends(get_current_user)):
+    if current_user.role not in ("instructor", "admin"):
+        raise HTTPException(status_code=403, detail="Instructor or admin access required")
+    return current_user
+
 # Streak utility
 def _today_utc_date_str() -> str:
     return datetime.now(timezone.utc).date().isoformat()
@@ -209,6 +295,11 @@ async def login(login_data: UserLogin):
     await db.users.update_one({"id": user["id"]}, {"$set": update_fields})
     # reflect latest values for response
     user.update(update_fields)
+    today = datetime.now(timezone.utc).date()
+    streak_leaderboard.update(
+        user["id"], update_fields["streak_count"], user["username"], update_fields["last_login_date"], today
+    )
+    await _record_activity(user["id"], today)
 
     user_obj = User(**user)
     token = create_access_token({"sub": user_obj.id})
@@ -219,6 +310,10 @@ async def login(login_data: UserLogin):
 async def get_me(current_user: User = Depends(get_current_user)):
     return current_user
 
+async def _record_activity(user_id: str, day: date):
+    query, update = activity.record(user_id, day)
+    await db.activity.update_one(query, update, upsert=True)
+
 # New streak endpoint
 @api_router.get("/streak")
 async def get_streak(current_user: User = Depends(get_current_user)):
@@ -227,42 +322,110 @@ async def get_streak(current_user: User = Depends(get_current_user)):
         "last_login_date": current_user.last_login_date
     }
 
+async def refresh_streak_leaderboard():
+    # Only live streaks are read, through the last_login_date index
+    today = datetime.now(timezone.utc).date()
+    users = await db.users.find(
+        {"last_login_date": {"$gte": (today - timedelta(days=1)).isoformat()}},
+        {"_id": 0, "id": 1, "username": 1, "streak_count": 1, "last_login_date": 1}
+    ).to_list(None)
+    streak_leaderboard.load(users, today)
+
+async def _leaderboard_job():
+    while True:
+        await asyncio.sleep(LEADERBOARD_REFRESH_SECONDS)
+        try:
+            await refresh_streak_leaderboard()
+        except Exception:
+            logger.exception("Leaderboard refresh failed")
+
+@api_router.get("/leaderboard/streaks")
+async def get_streak_leaderboard(limit: int = 10, current_user: User = Depends(get_current_user)):
+    today = datetime.now(timezone.utc).date()
+    limit = max(1, min(limit, 100))
+    return {
+        "entries": streak_leaderboard.top(limit, today),
+        "me": {
+            "rank": streak_leaderboard.rank(current_user.id, today),
+            # The stored count is only reset at the next login
+            "streak_count": live_streak(current_user.streak_count, current_user.last_login_date, today)
+        },
+        "total": len(streak_leaderboard)
+    }
+
+@api_router.get("/activity")
+async def get_activity(current_user: User = Depends(get_current_user)):
+    # A user has one small bitmap document per active year; read them all for streak history
+    docs = await db.activity.find({"user_id": current_user.id}, {"_id": 0}).to_list(None)
+    current_streak, longest_streak = activity.streaks(docs, datetime.now(timezone.utc).date())
+    return {
+        "active_days": [day.isoformat() for day in activity.active_days(docs)],
+        "current_streak": current_streak,
+        "longest_streak": longest_streak
+    }
+
 # ============= COURSE ROUTES =============
-@api_router.get("/courses", response_model=List[Course])
-async def get_courses(category: Optional[str] = None):
-    query = {}
-    if category:
-        query["category"] = category
-    
-    courses = await db.courses.find(query, {"_id": 0}).to_list(1000)
-    return courses
+@api_router.get("/courses", response_model=Union[CourseSearchResponse, List[Course]])
+async def get_courses(
+    category: List[str] = Query(default=[]),
+    difficulty: List[str] = Query(default=[]),
+    requires_terms: Optional[bool] = None,
+    q: Optional[str] = None,
+    facets: bool = False
+):
+    # Answered from the in-process catalog; repeated filter combinations hit its memo
+    await catalog.ensure_fresh(catalog_db)
+    filters = {"category": category, "difficulty": difficulty}
+    if requires_terms is not None:
+        filters["requires_terms"] = [requires_terms]
+    courses, facet_counts = catalog.search(filters, q)
+
+    if not facets:
+        return courses
+    return {
+        "courses": courses,
+        "facets": {
+            field: {str(value).lower() if isinstance(value, bool) else value: count for value, count in counts.items()}
+            for field, counts in facet_counts.items()
+        },
+        "catalog_version": catalog.version
+    }
 
 @api_router.get("/courses/{course_id}", response_model=Course)
 async def get_course(course_id: str):
-    course = await db.courses.find_one({"id": course_id}, {"_id": 0})
+    await catalog.ensure_fresh(catalog_db)
+    course = catalog.courses.get(course_id)
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
     return course
 
 @api_router.get("/courses/{course_id}/modules", response_model=List[Module])
 async def get_course_modules(course_id: str):
-    modules = await db.modules.find({"course_id": course_id}, {"_id": 0}).sort("order", 1).to_list(1000)
-    return modules
+    await catalog.ensure_fresh(catalog_db)
+    modules = catalog.modules.get(course_id, [])
+    bodies = await content_store.get_many(m["content_hash"] for m in modules if m.get("content_hash"))
+    if any(m.get("content_hash") and m["content_hash"] not in bodies for m in modules):
+        # get_many has logged the missing blobs; an empty lesson would look like real content
+        raise HTTPException(status_code=503, detail="Module content is temporarily unavailable")
+
+    # Modules not yet moved to the content store still carry their body inline
+    inline_ids = [m["id"] for m in modules if not m.get("content_hash")]
+    inline = {}
+    if inline_ids:
+        docs = await catalog_db.modules.find({"id": {"$in": inline_ids}}, {"_id": 0, "id": 1, "content": 1}).to_list(1000)
+        inline = {doc["id"]: doc.get("content", "") for doc in docs}
+
+    return [
+        {**module, "content": bodies[module["content_hash"]] if module.get("content_hash") else inline.get(module["id"], "")}
+        for module in modules
+    ]
 
 # ============= ENROLLMENT ROUTES =============
 @api_router.post("/enrollments", response_model=Enrollment)
 async def enroll_course(enrollment_data: EnrollmentRequest, current_user: User = Depends(get_current_user)):
-    # Check if already enrolled
-    existing = await db.enrollments.find_one({
-        "user_id": current_user.id,
-        "course_id": enrollment_data.course_id
-    }, {"_id": 0})
-    
-    if existing:
-        raise HTTPException(status_code=400, detail="Already enrolled in this course")
-    
     # Check if course exists
-    course = await db.courses.find_one({"id": enrollment_data.course_id}, {"_id": 0})
+    await catalog.ensure_fresh(catalog_db)
+    course = catalog.courses.get(enrollment_data.course_id)
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
     
@@ -275,17 +438,37 @@ async def enroll_course(enrollment_data: EnrollmentRequest, current_user: User =
         course_id=enrollment_data.course_id
     )
     
-    await db.enrollments.insert_one(enrollment.model_dump())
-    return enrollment
+    existing = await db.enrollments.find_one(
+        {"user_id": current_user.id, "course_id": enrollment_data.course_id}, {"_id": 1}
+    )
+    if existing:
+        raise HTTPException(status_code=400, detail="Already enrolled in this course")
+
+    # Upsert on the new id so MongoDB stamps `updated_at` on insert and never touches an
+    # existing enrollment; the unique (user_id, course_id) index rejects a concurrent duplicate.
+    try:
+        stored = await db.enrollments.find_one_and_update(
+            {"id": enrollment.id, "user_id": current_user.id, "course_id": enrollment_data.course_id},
+            {"$setOnInsert": enrollment.model_dump(exclude={"updated_at"}), "$currentDate": {"updated_at": True}},
+            projection={"_id": 0},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Already enrolled in this course")
+    return stored
 
 @api_router.get("/enrollments/my", response_model=List[dict])
 async def get_my_enrollments(current_user: User = Depends(get_current_user)):
-    enrollments = await db.enrollments.find({"user_id": current_user.id}, {"_id": 0}).to_list(1000)
+    enrollments = await db.enrollments.find(
+        {"user_id": current_user.id}, {"_id": 0, **{field: 0 for field in completion.INTERNAL_FIELDS}}
+    ).to_list(1000)
     
-    # Fetch course details for each enrollment
+    # Attach course details from the in-process catalog
+    await catalog.ensure_fresh(catalog_db)
     result = []
     for enrollment in enrollments:
-        course = await db.courses.find_one({"id": enrollment["course_id"]}, {"_id": 0})
+        course = catalog.courses.get(enrollment["course_id"])
         if course:
             result.append({
                 **enrollment,
@@ -297,33 +480,27 @@ async def get_my_enrollments(current_user: User = Depends(get_current_user)):
 # ============= PROGRESS ROUTES =============
 @api_router.put("/progress")
 async def update_progress(progress_data: ProgressUpdate, current_user: User = Depends(get_current_user)):
-    # Find or create progress record
-    existing = await db.progress.find_one({
-        "user_id": current_user.id,
-        "module_id": progress_data.module_id
-    }, {"_id": 0})
-    
-    if existing:
-        update_data = {
-            "completed": progress_data.completed,
-            "completed_at": datetime.now(timezone.utc).isoformat() if progress_data.completed else None
-        }
-        await db.progress.update_one(
-            {"user_id": current_user.id, "module_id": progress_data.module_id},
-            {"$set": update_data}
-        )
-    else:
-        progress = Progress(
-            user_id=current_user.id,
-            module_id=progress_data.module_id,
-            course_id=progress_data.course_id,
-            completed=progress_data.completed,
-            completed_at=datetime.now(timezone.utc).isoformat() if progress_data.completed else None
-        )
-        await db.progress.insert_one(progress.model_dump())
+    if PROGRESS_STORE == "bitset":
+        return await _update_progress_bitset(progress_data, current_user)
+
+    # Create or update the progress record in one upsert
+    progress = Progress(
+        user_id=current_user.id,
+        module_id=progress_data.module_id,
+        course_id=progress_data.course_id,
+        completed=progress_data.completed,
+        completed_at=datetime.now(timezone.utc).isoformat() if progress_data.completed else None
+    ).model_dump(exclude={"updated_at"})
+    update_data = {field: progress.pop(field) for field in ("completed", "completed_at")}
+    await db.progress.update_one(
+        {"user_id": progress.pop("user_id"), "module_id": progress.pop("module_id")},
+        {"$set": update_data, "$setOnInsert": progress, "$currentDate": {"updated_at": True}},
+        upsert=True
+    )
     
     # Update enrollment progress
-    total_modules = await db.modules.count_documents({"course_id": progress_data.course_id})
+    await catalog.ensure_fresh(catalog_db)
+    total_modules = catalog.module_count(progress_data.course_id)
     completed_modules = await db.progress.count_documents({
         "user_id": current_user.id,
         "course_id": progress_data.course_id,
@@ -334,13 +511,51 @@ async def update_progress(progress_data: ProgressUpdate, current_user: User = De
     
     await db.enrollments.update_one(
         {"user_id": current_user.id, "course_id": progress_data.course_id},
-        {"$set": {"progress": progress_percentage}}
+        {"$set": {"progress": progress_percentage}, "$currentDate": {"updated_at": True}}
     )
+    if progress_data.completed:
+        await _record_activity(current_user.id, datetime.now(timezone.utc).date())
     
     return {"message": "Progress updated", "progress": progress_percentage}
 
+async def _update_progress_bitset(progress_data: ProgressUpdate, current_user: User):
+    await catalog.ensure_fresh(catalog_db)
+    slot = catalog.module_slot(progress_data.course_id, progress_data.module_id)
+    if slot is None:
+        raise HTTPException(status_code=404, detail="Module not found")
+
+    enrollment = await db.enrollments.find_one_and_update(
+        {"user_id": current_user.id, "course_id": progress_data.course_id},
+        completion.completion_update(slot, progress_data.completed, _utc_now_iso()),
+        projection={"_id": 0, "completion_bits": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    if not enrollment:
+        raise HTTPException(status_code=404, detail="Not enrolled in this course")
+
+    modules = catalog.modules.get(progress_data.course_id, [])
+    completed_modules = completion.completed_count(enrollment, modules)
+    progress_percentage = (completed_modules / len(modules) * 100) if modules else 0
+
+    await db.enrollments.update_one(
+        {"user_id": current_user.id, "course_id": progress_data.course_id},
+        {"$set": {"progress": progress_percentage}, "$currentDate": {"updated_at": True}}
+    )
+    if progress_data.completed:
+        await _record_activity(current_user.id, datetime.now(timezone.utc).date())
+
+    return {"message": "Progress updated", "progress": progress_percentage}
+
 @api_router.get("/progress/course/{course_id}")
 async def get_course_progress(course_id: str, current_user: User = Depends(get_current_user)):
+    if PROGRESS_STORE == "bitset":
+        await catalog.ensure_fresh(catalog_db)
+        enrollment = await db.enrollments.find_one(
+            {"user_id": current_user.id, "course_id": course_id},
+            {"_id": 0, "user_id": 1, "course_id": 1, "completion_bits": 1, "completion_times": 1}
+        )
+        return completion.expand(enrollment, catalog.modules.get(course_id, [])) if enrollment else []
+
     progress_records = await db.progress.find({
         "user_id": current_user.id,
         "course_id": course_id
@@ -348,6 +563,348 @@ async def get_course_progress(course_id: str, current_user: User = Depends(get_c
     
     return progress_records
 
+# ============= RECOMMENDATION ROUTES =============
+@api_router.get("/recommendations", response_model=List[dict])
+async def get_recommendations(limit: int = 5, current_user: User = Depends(get_current_user)):
+    limit = max(1, min(limit, 20))
+    enrollments = await db.enrollments.find(
+        {"user_id": current_user.id}, {"_id": 0, "course_id": 1}
+    ).to_list(1000)
+    ranked = course_recommendations.recommend((e["course_id"] for e in enrollments), limit)
+    await catalog.ensure_fresh(catalog_db)
+    return [
+        {"course": catalog.courses[course_id], "score": score}
+        for course_id, score in ranked
+        if course_id in catalog.courses
+    ]
+
+async def refresh_recommendations():
+    user_ids, course_ids, weights = [], [], []
+    cursor = analytics_db.enrollments.find(
+        {}, {"_id": 0, "user_id": 1, "course_id": 1, "progress": 1}
+    ).batch_size(5000)
+    async for enrollment in cursor:
+        user_ids.append(enrollment["user_id"])
+        course_ids.append(enrollment["course_id"])
+        # Finishing a course is a stronger signal than merely enrolling
+        weights.append(1.0 + float(enrollment.get("progress", 0.0)) / 100.0)
+
+    neighbors, popularity = await asyncio.to_thread(build_neighbor_table, user_ids, course_ids, weights)
+    computed_at = _utc_now_iso()
+    course_recommendations.replace(neighbors, popularity, computed_at)
+
+    if popularity:
+        await db.course_neighbors.bulk_write([
+            ReplaceOne(
+                {"course_id": course_id},
+                {
+                    "course_id": course_id,
+                    "neighbors": [{"course_id": n, "score": score} for n, score in neighbors.get(course_id, [])],
+                    "popularity": count,
+                    "computed_at": computed_at
+                },
+                upsert=True
+            )
+            for course_id, count in popularity.items()
+        ], ordered=False)
+    await db.course_neighbors.delete_many({"course_id": {"$nin": list(popularity)}})
+    logger.info("Recommendations refreshed: %d courses from %d enrollments", len(popularity), len(user_ids))
+
+async def load_recommendations():
+    """Serve the table last persisted by whichever instance refreshed it."""
+    stored = await db.course_neighbors.find({}, {"_id": 0}).to_list(None)
+    if stored:
+        course_recommendations.replace(
+            {doc["course_id"]: [(n["course_id"], n["score"]) for n in doc["neighbors"]] for doc in stored},
+            {doc["course_id"]: doc["popularity"] for doc in stored},
+            max(doc["computed_at"] for doc in stored)
+        )
+
+async def _acquire_job_lease(name: str, seconds: int) -> bool:
+    """Hold `name` for `seconds` unless another instance holds an unexpired lease on it."""
+    now = datetime.now(timezone.utc)
+    try:
+        lease = await db.job_leases.find_one_and_update(
+            {"_id": name, "$or": [{"expires_at": {"$lte": now}}, {"holder": INSTANCE_ID}]},
+            {"$set": {"holder": INSTANCE_ID, "expires_at": now + timedelta(seconds=seconds)}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        return False  # held by another instance (the upsert collided with its lease)
+    return lease is not None
+
+async def _recommendations_job():
+    # One instance per refresh interval recomputes; the lease outlives restarts, so a
+    # redeploy does not recompute a table that is still fresh. The others reload it.
+    while True:
+        try:
+            if await _acquire_job_lease("recommendations", RECOMMENDATIONS_REFRESH_SECONDS):
+                await refresh_recommendations()
+            else:
+                await load_recommendations()
+        except Exception:
+            logger.exception("Recommendation refresh failed")
+        await asyncio.sleep(RECOMMENDATIONS_REFRESH_SECONDS)
+
+# ============= SYNC ROUTES =============
+SYNC_PAGE_SIZE = 1000
+# `updated_at` is stamped by MongoDB ($currentDate) inside each write, so no
+# API clock is involved; tokens are derived from the stamps returned. A write
+# becomes visible a moment after its stamp, so a complete sync hands back a
+# token slightly before the newest stamp it saw to pick up in-flight writes.
+# Re-delivered records are harmless: clients upsert them by `id`.
+SYNC_OVERLAP = timedelta(seconds=5)
+SYNC_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+SYNC_COLLECTIONS = ("enrollments", "progress")
+# Records written before server-side stamping carry a string or no `updated_at`
+# (see scripts/backfill_updated_at.py); a full sync delivers them first, by _id.
+SYNC_UNSTAMPED = {"$not": {"$type": "date"}}
+
+# Each collection is read from its own cursor, carried in the token:
+#   ["unstamped", last _id or None]  full sync, still walking unstamped records
+#   ["after", stamp, last _id]       mid-way through a page boundary: strictly after (stamp, _id)
+#   ["since", stamp]                 caught up: everything stamped at or after `stamp`
+# Paging on (updated_at, _id) never skips or repeats records that share a stamp.
+
+def _encode_sync_token(cursors: Dict[str, list]) -> str:
+    encoded = "v2:" + json.dumps(cursors, separators=(",", ":"))
+    return base64.urlsafe_b64encode(encoded.encode()).decode().rstrip("=")
+
+def _parse_id(value):
+    return ObjectId(value) if isinstance(value, str) and ObjectId.is_valid(value) else value
+
+def _parse_stamp(value: str) -> datetime:
+    stamp = datetime.fromisoformat(value)
+    return stamp if stamp.tzinfo else stamp.replace(tzinfo=timezone.utc)
+
+def _decode_sync_token(token: str) -> Dict[str, list]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        version, payload = base64.urlsafe_b64decode(padded.encode()).decode().split(":", 1)
+        if version == "v1":
+            # Tokens handed out before per-collection cursors: a single watermark
+            return {name: ["since", _parse_stamp(payload)] for name in SYNC_COLLECTIONS}
+        if version != "v2":
+            raise ValueError(version)
+        cursors = {}
+        for name, cursor in json.loads(payload).items():
+            if name not in SYNC_COLLECTIONS:
+                raise ValueError(name)
+            kind, *position = cursor
+            if kind == "unstamped":
+                cursors[name] = [kind, _parse_id(position[0])]
+            elif kind == "after":
+                cursors[name] = [kind, _parse_stamp(position[0]), _parse_id(position[1])]
+            elif kind == "since":
+                cursors[name] = [kind, _parse_stamp(position[0])]
+            else:
+                raise ValueError(kind)
+        return cursors
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+
+def _token_cursor(cursor: list) -> list:
+    return [value.isoformat(timespec="microseconds") if isinstance(value, datetime) else
+            str(value) if isinstance(value, ObjectId) else value for value in cursor]
+
+def _sync_stamp(record: dict) -> Optional[datetime]:
+    # MongoDB hands back naive UTC datetimes
+    value = record.get("updated_at")
+    if not isinstance(value, datetime):
+        return None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+async def _sync_page(collection, user_id: str, cursor: list):
+    """Up to SYNC_PAGE_SIZE records after `cursor`, and the cursor to continue from."""
+    records = []
+    kind = cursor[0]
+    if kind == "unstamped":
+        query = {"user_id": user_id, "updated_at": SYNC_UNSTAMPED}
+        if cursor[1] is not None:
+            query["_id"] = {"$gt": cursor[1]}
+        records = await collection.find(query).sort("_id", 1).to_list(SYNC_PAGE_SIZE)
+        if len(records) >= SYNC_PAGE_SIZE:
+            return records, ["unstamped", records[-1]["_id"]]
+        query = {"user_id": user_id, "updated_at": {"$type": "date"}}
+    elif kind == "after":
+        _, stamp, last_id = cursor
+        query = {"user_id": user_id, "$or": [
+            {"updated_at": {"$gt": stamp}},
+            {"updated_at": stamp, "_id": {"$gt": last_id}},
+        ]}
+    else:
+        query = {"user_id": user_id, "updated_at": {"$gte": cursor[1]}}
+
+    records += await collection.find(query).sort([("updated_at", 1), ("_id", 1)]).to_list(
+        SYNC_PAGE_SIZE - len(records)
+    )
+    stamps = [stamp for stamp in map(_sync_stamp, records) if stamp]
+    if len(records) >= SYNC_PAGE_SIZE:
+        return records, ["after", stamps[-1], records[-1]["_id"]]
+
+    # Caught up: continue a little before the newest stamp seen, to pick up in-flight writes
+    watermark = stamps[-1] - SYNC_OVERLAP if stamps else SYNC_EPOCH
+    if kind == "after":
+        watermark = max(watermark, cursor[1] - SYNC_OVERLAP)
+    elif kind == "since":
+        watermark = max(watermark, cursor[1])
+    return records, ["since", watermark]
+
+@api_router.get("/sync")
+async def sync_changes(since: Optional[str] = None, current_user: User = Depends(get_current_user)):
+    cursors = _decode_sync_token(since) if since else {name: ["unstamped", None] for name in SYNC_COLLECTIONS}
+
+    enrollments, cursors["enrollments"] = await _sync_page(db.enrollments, current_user.id, cursors["enrollments"])
+    if PROGRESS_STORE == "bitset":
+        # Completion lives on the enrollment, and every completion write bumps its `updated_at`
+        progress_records = []
+    else:
+        progress_records, cursors["progress"] = await _sync_page(db.progress, current_user.id, cursors["progress"])
+
+    has_more = any(cursor[0] != "since" for cursor in cursors.values())
+    for record in [*enrollments, *progress_records]:
+        record.pop("_id", None)
+
+    if PROGRESS_STORE == "bitset":
+        await catalog.ensure_fresh(catalog_db)
+        for enrollment in enrollments:
+            # Every module of a changed enrollment, so un-completed modules reach the client too
+            progress_records.extend(completion.expand(
+                enrollment, catalog.modules.get(enrollment["course_id"], []), include_incomplete=True
+            ))
+
+    return {
+        "enrollments": [completion.public(enrollment) for enrollment in enrollments],
+        "progress": progress_records,
+        "has_more": has_more,
+        "full": not since,
+        "next_token": _encode_sync_token({name: _token_cursor(cursor) for name, cursor in cursors.items()})
+    }
+
+# ============= ADMIN ROUTES =============
+BULK_ENROLLMENT_BATCH = 1000
+
+async def _bulk_enroll_batch(keys: List[str], course_ids: List[str], seen: set) -> List[dict]:
+    """Enroll a batch of user ids / emails; users already in `seen` (named by another key) are skipped."""
+    users = await db.users.find(
+        {"$or": [{"id": {"$in": keys}}, {"email": {"$in": keys}}]},
+        {"_id": 0, "id": 1, "email": 1}
+    ).to_list(None)
+    user_ids = {}
+    for user in users:
+        user_ids[user["id"]] = user["id"]
+        user_ids[user["email"]] = user["id"]
+
+    results, operations = [], []
+    for key in keys:
+        user_id = user_ids.get(key)
+        if user_id:
+            # One outcome per (user, course), however many times the request names the user
+            if user_id in seen:
+                continue
+            seen.add(user_id)
+        for course_id in course_ids:
+            result = {"user": key, "user_id": user_id, "course_id": course_id}
+            results.append(result)
+            if not user_id:
+                result["status"] = "user_not_found"
+                continue
+            result["status"] = "already_enrolled"
+            enrollment = Enrollment(user_id=user_id, course_id=course_id)
+            # $currentDate also touches existing enrollments; sync just re-delivers them
+            operations.append((result, UpdateOne(
+                {"user_id": user_id, "course_id": course_id},
+                {"$setOnInsert": enrollment.model_dump(exclude={"updated_at"}), "$currentDate": {"updated_at": True}},
+                upsert=True
+            )))
+
+    if operations:
+        try:
+            outcome = (await db.enrollments.bulk_write([op for _, op in operations], ordered=False)).bulk_api_result
+        except BulkWriteError as e:
+            outcome = e.details
+        for upserted in outcome.get("upserted", []):
+            operations[upserted["index"]][0]["status"] = "enrolled"
+        for error in outcome.get("writeErrors", []):
+            # A concurrent enrollment winning the unique index race is still "already enrolled"
+            if error.get("code") != 11000:
+                operations[error["index"]][0]["status"] = "failed"
+    return results
+
+@api_router.post("/admin/enrollments/bulk")
+async def bulk_enroll(request: BulkEnrollmentRequest, stream: bool = False, current_user: User = Depends(get_current_staff)):
+    await catalog.ensure_fresh(catalog_db)
+    course_ids = list(dict.fromkeys(request.course_ids))
+    unknown = [course_id for course_id in course_ids if course_id not in catalog.courses]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Course not found: {', '.join(unknown)}")
+    if not request.terms_accepted and any(catalog.courses[c].get("requires_terms", False) for c in course_ids):
+        raise HTTPException(status_code=400, detail="Terms and conditions must be accepted for this course")
+
+    keys = list(dict.fromkeys([*request.user_ids, *request.emails]))
+    batches = [keys[i:i + BULK_ENROLLMENT_BATCH] for i in range(0, len(keys), BULK_ENROLLMENT_BATCH)]
+
+    seen = set()
+    if not stream:
+        results = []
+        for batch in batches:
+            results.extend(await _bulk_enroll_batch(batch, course_ids, seen))
+        summary = {}
+        for result in results:
+            summary[result["status"]] = summary.get(result["status"], 0) + 1
+        return {"summary": summary, "results": results}
+
+    async def progress_lines():
+        summary, processed = {}, 0
+        for batch in batches:
+            results = await _bulk_enroll_batch(batch, course_ids, seen)
+            processed += len(batch)
+            for result in results:
+                summary[result["status"]] = summary.get(result["status"], 0) + 1
+            yield json.dumps({"processed_users": processed, "total_users": len(keys), "results": results}) + "\n"
+        yield json.dumps({"done": True, "summary": summary}) + "\n"
+
+    return StreamingResponse(progress_lines(), media_type="application/x-ndjson")
+
+EXPORT_MAX_BATCH_SIZE = 10000
+
+@api_router.get("/admin/export")
+async def export_learner_data(
+    kind: str = "enrollments",
+    format: str = "ndjson",
+    course_id: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    batch_size: int = 1000,
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_staff)
+):
+    try:
+        validate_export(kind, format, cursor)
+    except ExportError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if kind == "users" and not course_id and current_user.role != "admin":
+        # Instructors only see the learners of a course; the full user list is admin-only
+        raise HTTPException(status_code=403, detail="Exporting all users requires admin access; pass a course_id")
+
+    modules_by_course = None
+    if PROGRESS_STORE == "bitset":
+        await catalog.ensure_fresh(catalog_db)
+        modules_by_course = catalog.modules
+
+    batches = export_rows(
+        analytics_db, kind, course_id=course_id, since=since, until=until,
+        batch_size=max(1, min(batch_size, EXPORT_MAX_BATCH_SIZE)), cursor=cursor,
+        modules_by_course=modules_by_course
+    )
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/csv"
+    return StreamingResponse(
+        export_text(batches, kind, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{kind}.{format}"'}
+    )
+
 # ============= PROFILE ROUTES =============
 @api_router.get("/profile", response_model=User)
 async def get_profile(current_user: User = Depends(get_current_user)):
@@ -384,8 +941,18 @@ async def update_profile(profile_data: ProfileUpdate, current_user: User = Depen
         )
     
     updated_user = await db.users.find_one({"id": current_user.id}, {"_id": 0})
+    if "username" in update_fields:
+        streak_leaderboard.rename(current_user.id, update_fields["username"])
     return User(**updated_user)
 
+# ============= HEALTH =============
+@api_router.get("/health")
+async def health():
+    # Readiness for the load balancer: false until every startup phase has finished
+    if not getattr(app.state, "ready", False):
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Starting up")
+    return {"status": "ok", "import_seconds": round(IMPORT_SECONDS, 3), "startup_seconds": startup_timings}
+
 # Include router
 app.include_router(api_router)
 app.add_middleware(
@@ -396,12 +963,97 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request profiling is opt-in: without a sample rate or token the middleware is never installed
+PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', 0))
+PROFILING_TOKEN = os.environ.get('PROFILING_TOKEN', '')
+if PROFILING_SAMPLE_RATE > 0 or PROFILING_TOKEN:
+    app.add_middleware(
+        ProfilingMiddleware,
+        output_dir=os.environ.get('PROFILING_DIR', str(ROOT_DIR / 'profiles')),
+        sample_rate=PROFILING_SAMPLE_RATE,
+        token=PROFILING_TOKEN,
+        max_profiles=int(os.environ.get('PROFILING_MAX_PROFILES', 200))
+    )
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
 
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
+
+# Seconds spent in each startup phase, reported by /api/health and the startup benchmark
+startup_timings: Dict[str, float] = {}
+
+def _timed_startup(phase):
+    @functools.wraps(phase)
+    async def run():
+        started = time.perf_counter()
+        await phase()
+        startup_timings[phase.__name__] = round(time.perf_counter() - started, 3)
+    return run
+
+@app.on_event("startup")
+@_timed_startup
+async def warm_up():
+    app.state.ready = False
+    # Open the connection pool (TLS handshakes and auth included) instead of on the first requests
+    await asyncio.gather(*(db.command("ping") for _ in range(max(MONGO_MIN_POOL_SIZE, 1))))
+    # passlib loads and self-tests the bcrypt backend on first use
+    await asyncio.to_thread(pwd_context.handler("bcrypt").get_backend)
+    # FastAPI builds the OpenAPI schema (every model's JSON schema) lazily on first request
+    app.openapi()
+
+@app.on_event("startup")
+@_timed_startup
+async def create_indexes():
+    await asyncio.gather(
+        db.enrollments.create_index([("user_id", 1), ("updated_at", 1)]),
+        db.progress.create_index([("user_id", 1), ("updated_at", 1)]),
+        db.users.create_index("id", unique=True),
+        db.users.create_index("email"),
+        db.users.create_index("username"),
+        db.users.create_index("last_login_date"),
+        db.progress.create_index([("user_id", 1), ("module_id", 1)]),
+        # Replaces the old non-unique index; logs instead of failing startup while duplicates remain
+        ensure_unique_enrollment_index(db),
+        db.courses.create_index("id", unique=True),
+        db.modules.create_index("id"),
+        db.enrollments.create_index([("course_id", 1), ("_id", 1)]),
+        db.progress.create_index([("course_id", 1), ("_id", 1)]),
+        db.activity.create_index("user_id"),
+    )
+
+@app.on_event("startup")
+@_timed_startup
+async def load_catalog():
+    await catalog.ensure_fresh(catalog_db)
+
+@app.on_event("startup")
+@_timed_startup
+async def load_streak_leaderboard():
+    await refresh_streak_leaderboard()
+    app.state.leaderboard_task = asyncio.create_task(_leaderboard_job())
+
+@app.on_event("startup")
+@_timed_startup
+async def start_recommendations():
+    # Serve the last persisted table right away; the job refreshes it in the background
+    await load_recommendations()
+    app.state.recommendations_task = asyncio.create_task(_recommendations_job())
+
+@app.on_event("startup")
+async def mark_ready():
+    app.state.ready = True
+    logger.info(
+        "Ready: imports %.3fs, startup %s (%.3fs since process start)",
+        IMPORT_SECONDS, startup_timings, time.perf_counter() - _IMPORT_STARTED
+    )
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    app.state.ready = False
+    app.state.recommendations_task.cancel()
+    app.state.leaderboard_task.cancel()
     client.close()
@@ -0,0 +1,278 @@
+"""Cohort retention, completion funnel and streak reports.
+
+Streams users, enrollments, progress and daily activity out of MongoDB in
+projected, batched cursors and aggregates them with pandas. Progress rows
+and activity bitmaps are reduced chunk by chunk to (user, active day) pairs
+and per-user counters, so memory is bounded by the number of users rather
+than the number of progress rows. Retention counts a user as active on any
+day they logged in or completed a module.
+
+Usage:
+    python scripts/analytics.py --out reports --format csv
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+import activity
+from read_routing import routed_database
+
+# Load environment variables
+load_dotenv(Path(__file__).parent.parent / 'backend' / '.env')
+
+STREAK_BINS = [-1, 0, 1, 3, 7, 14, 30, np.inf]
+STREAK_LABELS = ["0", "1", "2-3", "4-7", "8-14", "15-30", "31+"]
+EPOCH = pd.Timestamp("1970-01-01", tz="UTC")
+
+
+async def stream_frames(collection, query, projection, batch_size):
+    """Yield DataFrames of at most `batch_size` rows from a projected cursor."""
+    cursor = collection.find(query, {"_id": 0, **projection}).batch_size(batch_size)
+    batch = []
+    async for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            yield pd.DataFrame.from_records(batch, columns=list(projection))
+            batch = []
+    if batch:
+        yield pd.DataFrame.from_records(batch, columns=list(projection))
+
+
+def to_day(values: pd.Series) -> pd.Series:
+    """ISO timestamps -> integer days since epoch (NaN for missing/garbage)."""
+    parsed = pd.to_datetime(values, utc=True, errors="coerce", format="ISO8601")
+    return (parsed - EPOCH).dt.days
+
+
+async def load_users(db, batch_size):
+    frames = []
+    async for chunk in stream_frames(
+        db.users, {}, {"id": 1, "created_at": 1, "streak_count": 1, "last_login_date": 1}, batch_size
+    ):
+        frames.append(pd.DataFrame({
+            "id": chunk["id"],
+            "signup_day": to_day(chunk["created_at"]).astype("float32"),
+            "streak_count": pd.to_numeric(chunk["streak_count"], errors="coerce").fillna(0).astype("int32"),
+            "last_login_day": to_day(chunk["last_login_date"]).astype("float32"),
+        }))
+    users = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+        columns=["id", "signup_day", "streak_count", "last_login_day"]
+    )
+    return users.set_index("id")
+
+
+async def load_enrollments(db, user_index, batch_size):
+    frames = []
+    async for chunk in stream_frames(db.enrollments, {}, {"user_id": 1, "course_id": 1, "progress": 1}, batch_size):
+        frames.append(pd.DataFrame({
+            "user": user_index.get_indexer(chunk["user_id"]).astype("int32"),
+            "course_id": chunk["course_id"].astype("category"),
+            "progress": pd.to_numeric(chunk["progress"], errors="coerce").fillna(0).astype("float32"),
+        }))
+    if not frames:
+        return pd.DataFrame(columns=["user", "course_id", "progress"])
+    enrollments = pd.concat(frames, ignore_index=True)
+    enrollments = enrollments[enrollments["user"] >= 0].reset_index(drop=True)
+    enrollments["course_id"] = enrollments["course_id"].astype("category")
+    return enrollments
+
+
+async def load_activity(db, user_index, batch_size, progress_store="documents", compact_every=50):
+    """Reduce completed progress to unique (user, day) pairs and per-user completion counts.
+
+    Completions are read from the store named by `progress_store` only: the
+    bitset migration leaves db.progress in place, so reading both would count
+    every migrated completion twice.
+    """
+    completions = np.zeros(len(user_index), dtype=np.int64)
+    pending, days = [], pd.DataFrame(columns=["user", "day"], dtype="int32")
+
+    if progress_store == "bitset":
+        # Completion times live inline on the enrollments
+        chunks = stream_frames(
+            db.enrollments, {"completion_times": {"$exists": True}}, {"user_id": 1, "completion_times": 1}, batch_size
+        )
+    else:
+        chunks = stream_frames(db.progress, {"completed": True}, {"user_id": 1, "completed_at": 1}, batch_size)
+
+    async for chunk in chunks:
+        if progress_store == "bitset":
+            times = chunk["completion_times"].map(lambda value: list((value or {}).values())).explode().dropna()
+            user_ids, times = chunk["user_id"].loc[times.index], times.to_numpy()
+        else:
+            user_ids, times = chunk["user_id"], chunk["completed_at"]
+        users = user_index.get_indexer(user_ids)
+        known = users >= 0
+        completions += np.bincount(users[known], minlength=len(user_index))
+        pairs = pd.DataFrame({"user": users, "day": to_day(pd.Series(times)).to_numpy()})[known].dropna()
+        pending.append(pairs.astype("int32").drop_duplicates())
+        if len(pending) >= compact_every:
+            days = pd.concat([days, *pending], ignore_index=True).drop_duplicates()
+            pending = []
+
+    days = pd.concat([days, *pending], ignore_index=True).drop_duplicates()
+    return days, completions
+
+
+async def load_active_days(db, user_index, batch_size):
+    """(user, day) pairs from the daily activity bitmaps (logins and completions)."""
+    frames = []
+    async for chunk in stream_frames(db.activity, {}, {"user_id": 1, "year": 1, "days": 1}, batch_size):
+        users, day_numbers = [], []
+        for user_id, year, words in zip(chunk["user_id"], chunk["year"], chunk["days"]):
+            for day in activity.active_days([{"year": int(year), "days": words}]):
+                users.append(user_id)
+                day_numbers.append((day - EPOCH.date()).days)
+        indexed = user_index.get_indexer(pd.Index(users, dtype=object))
+        frames.append(pd.DataFrame({"user": indexed, "day": day_numbers}, dtype="int64")[indexed >= 0])
+    if not frames:
+        return pd.DataFrame(columns=["user", "day"], dtype="int32")
+    return pd.concat(frames, ignore_index=True).astype("int32").drop_duplicates()
+
+
+def cohort_retention(users: pd.DataFrame, days: pd.DataFrame, weeks: int) -> pd.DataFrame:
+    signup = users["signup_day"].to_numpy(dtype="float64")
+    valid = ~np.isnan(signup)
+
+    # `days` holds completions and the activity bitmaps; the last login on the user
+    # also covers logins from before the bitmaps (see scripts/backfill_activity.py)
+    logins = pd.DataFrame({"user": np.arange(len(users)), "day": users["last_login_day"].to_numpy()}).dropna()
+    activity = pd.concat([days, logins.astype("int32")], ignore_index=True)
+    activity = activity[valid[activity["user"].to_numpy()]]
+    offset = activity["day"].to_numpy() - signup[activity["user"].to_numpy()]
+
+    cohort_day = signup[valid].astype("int64")
+    cohort = pd.Series(
+        # Day 0 of the epoch is a Thursday; shift so cohorts start on Mondays
+        pd.to_datetime((cohort_day - (cohort_day + 3) % 7), unit="D").date,
+        index=np.flatnonzero(valid)
+    )
+
+    in_window = (offset >= 0) & (offset < weeks * 7)
+    active = pd.DataFrame({
+        "user": activity["user"].to_numpy()[in_window],
+        "week": (offset[in_window] // 7).astype("int32"),
+    }).drop_duplicates()
+    active["cohort"] = cohort.reindex(active["user"]).to_numpy()
+    table = active.pivot_table(index="cohort", columns="week", values="user", aggfunc="count", fill_value=0)
+    table = table.reindex(columns=range(weeks), fill_value=0)
+
+    retained_d7 = activity[(offset >= 1) & (offset <= 7)]["user"].drop_duplicates()
+    sizes = cohort.value_counts().sort_index()
+    report = table.reindex(sizes.index, fill_value=0).div(sizes, axis=0)
+    report.columns = [f"week_{week}" for week in report.columns]
+    report.insert(0, "users", sizes)
+    report.insert(1, "retained_d7", cohort.reindex(retained_d7).value_counts().reindex(sizes.index, fill_value=0) / sizes)
+    report.index.name = "signup_week"
+    return report.reset_index()
+
+
+def completion_funnel(enrollments: pd.DataFrame) -> pd.DataFrame:
+    progress = enrollments["progress"]
+    stages = pd.DataFrame({
+        "course_id": enrollments["course_id"],
+        "enrolled": 1,
+        "started": (progress > 0).astype("int8"),
+        "halfway": (progress >= 50).astype("int8"),
+        "completed": (progress >= 100).astype("int8"),
+    })
+    funnel = stages.groupby("course_id", observed=True).sum()
+    funnel["completion_rate"] = funnel["completed"] / funnel["enrolled"]
+    return funnel.sort_values("enrolled", ascending=False).reset_index()
+
+
+def streak_distribution(users: pd.DataFrame, enrollments: pd.DataFrame, completions: np.ndarray, today_day: int):
+    # Stored streaks go stale once a user stops logging in; anything older than yesterday has lapsed
+    streak = users["streak_count"].to_numpy().copy()
+    streak[~(users["last_login_day"].to_numpy() >= today_day - 1)] = 0
+
+    completed = enrollments[enrollments["progress"] >= 100]
+    courses_completed = np.bincount(completed["user"].to_numpy(), minlength=len(users))
+
+    frame = pd.DataFrame({
+        "streak_bucket": pd.cut(streak, STREAK_BINS, labels=STREAK_LABELS),
+        "modules_completed": completions,
+        "courses_completed": courses_completed,
+    })
+    report = frame.groupby("streak_bucket", observed=False).agg(
+        users=("modules_completed", "size"),
+        mean_modules_completed=("modules_completed", "mean"),
+        mean_courses_completed=("courses_completed", "mean"),
+    ).reset_index()
+    # Spearman = Pearson on ranks (pandas' method="spearman" needs scipy)
+    correlation = pd.Series(streak).rank().corr(pd.Series(courses_completed).rank())
+    return report, correlation
+
+
+def write_report(frame: pd.DataFrame, out_dir: Path, name: str, fmt: str):
+    path = out_dir / f"{name}.{fmt}"
+    if fmt == "parquet":
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_csv(path, index=False)
+    print(f"✓ Wrote {path} ({len(frame)} rows)")
+
+
+async def run(args):
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    # Full scans belong on a secondary when there is one
+    db = routed_database(
+        client, os.environ['DB_NAME'], os.environ.get('ANALYTICS_READ_PREFERENCE', 'secondaryPreferred'),
+        int(os.environ.get('READ_MAX_STALENESS_SECONDS', 90))
+    )
+    started = time.perf_counter()
+
+    users = await load_users(db, args.batch_size)
+    user_index = users.index
+    enrollments = await load_enrollments(db, user_index, args.batch_size)
+    days, completions = await load_activity(
+        db, user_index, args.batch_size, os.environ.get('PROGRESS_STORE', 'documents')
+    )
+    days = pd.concat([days, await load_active_days(db, user_index, args.batch_size)], ignore_index=True)
+    days = days.drop_duplicates()
+    client.close()
+    print(f"Loaded {len(users)} users, {len(enrollments)} enrollments, "
+          f"{int(completions.sum())} completions in {time.perf_counter() - started:.1f}s")
+
+    users = users.reset_index(drop=True)
+    today_day = (pd.Timestamp.now(tz="UTC").normalize() - EPOCH).days
+    streaks, correlation = streak_distribution(users, enrollments, completions, today_day)
+
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    write_report(cohort_retention(users, days, args.weeks), out_dir, "cohort_retention", args.format)
+    write_report(completion_funnel(enrollments), out_dir, "completion_funnel", args.format)
+    write_report(streaks, out_dir, "streak_distribution", args.format)
+    print(f"Streak vs. courses completed (Spearman): {correlation:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--out", default="reports", help="output directory")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--batch-size", type=int, default=10000, help="documents per cursor batch")
+    parser.add_argument("--weeks", type=int, default=8, help="weeks of retention to report")
+    args = parser.parse_args()
+
+    if args.format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            sys.exit("Parquet output requires pyarrow: pip install pyarrow")
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Backfill db.activity bitmaps from existing history.
+
+Marks every day a user completed a module (progress.completed_at, or the
+completion times on enrollments migrated to bitsets) and each user's
+last_login_date. Bits are ORed in, so the backfill is safe to re-run and
+never clears activity recorded by the API.
+"""
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+import os
+from dotenv import load_dotenv
+
+import activity
+
+# Load environment variables
+load_dotenv(Path(__file__).parent.parent / 'backend' / '.env')
+
+mongo_url = os.environ['MONGO_URL']
+db_name = os.environ['DB_NAME']
+
+
+def _day(value):
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).date()
+    except (AttributeError, ValueError):
+        return None
+
+
+async def backfill(batch_size: int):
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[db_name]
+
+    # user_id -> set of active days
+    days = {}
+
+    def mark(user_id, value):
+        day = _day(value)
+        if day:
+            days.setdefault(user_id, set()).add(day)
+
+    async for record in db.progress.find(
+        {"completed": True}, {"_id": 0, "user_id": 1, "completed_at": 1}
+    ).batch_size(batch_size):
+        mark(record["user_id"], record.get("completed_at"))
+    async for enrollment in db.enrollments.find(
+        {"completion_times": {"$exists": True}}, {"_id": 0, "user_id": 1, "completion_times": 1}
+    ).batch_size(batch_size):
+        for value in (enrollment.get("completion_times") or {}).values():
+            mark(enrollment["user_id"], value)
+    async for user in db.users.find(
+        {"last_login_date": {"$ne": None}}, {"_id": 0, "id": 1, "last_login_date": 1}
+    ).batch_size(batch_size):
+        mark(user["id"], user.get("last_login_date"))
+    print(f"✓ Collected activity for {len(days)} users")
+
+    operations, written = [], 0
+    for user_id, user_days in days.items():
+        for year, words in activity.pack(user_days).items():
+            operations.append(UpdateOne(
+                {"_id": f"{user_id}:{year}"},
+                {
+                    "$bit": {f"days.{word}": {"or": bits} for word, bits in words.items()},
+                    "$setOnInsert": {"user_id": user_id, "year": year},
+                },
+                upsert=True
+            ))
+        if len(operations) >= batch_size:
+            await db.activity.bulk_write(operations, ordered=False)
+            written += len(operations)
+            operations = []
+    if operations:
+        await db.activity.bulk_write(operations, ordered=False)
+        written += len(operations)
+
+    print(f"✓ Wrote {written} activity year documents")
+    client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    asyncio.run(backfill(parser.parse_args().batch_size))
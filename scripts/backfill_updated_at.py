@@ -0,0 +1,71 @@
+"""Backfill `updated_at` on enrollments and progress for /api/sync.
+
+`updated_at` is stamped by MongoDB as a date on every write. Records from
+before that carry an ISO string or no `updated_at` at all; they sort ahead
+of every date and are never matched by an incremental sync. This converts
+strings to dates and fills in missing values from `enrolled_at` /
+`completed_at` (or now). Safe to re-run.
+
+Usage:
+    python scripts/backfill_updated_at.py [--batch-size 1000]
+"""
+import argparse
+import asyncio
+from datetime import datetime, timezone
+from pathlib import Path
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv(Path(__file__).parent.parent / 'backend' / '.env')
+
+mongo_url = os.environ['MONGO_URL']
+db_name = os.environ['DB_NAME']
+
+# Field used when `updated_at` is missing
+FALLBACK_FIELDS = {"enrollments": "enrolled_at", "progress": "completed_at"}
+
+
+def _parse(value):
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+async def backfill(db, name: str, batch_size: int) -> int:
+    collection = db[name]
+    fallback = FALLBACK_FIELDS[name]
+    now = datetime.now(timezone.utc)
+    operations, written = [], 0
+    cursor = collection.find(
+        {"$or": [{"updated_at": {"$exists": False}}, {"updated_at": {"$type": "string"}}]},
+        {"_id": 1, "updated_at": 1, fallback: 1}
+    ).batch_size(batch_size)
+    async for doc in cursor:
+        stamp = _parse(doc.get("updated_at")) or _parse(doc.get(fallback)) or now
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"updated_at": stamp}}))
+        if len(operations) >= batch_size:
+            written += (await collection.bulk_write(operations, ordered=False)).modified_count
+            operations = []
+    if operations:
+        written += (await collection.bulk_write(operations, ordered=False)).modified_count
+    return written
+
+
+async def main(batch_size: int):
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[db_name]
+    for name in FALLBACK_FIELDS:
+        print(f"✓ {name}: {await backfill(db, name, batch_size)} records updated")
+    client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    asyncio.run(main(parser.parse_args().batch_size))
@@ -0,0 +1,67 @@
+"""Benchmark API cold start.
+
+Starts the backend in fresh interpreters, one after another, and reports
+how long imports and each startup phase took (the same numbers /api/health
+serves). Use --max-seconds in CI to fail when cold start regresses.
+
+Usage:
+    python scripts/benchmark_startup.py [--runs 5] [--import-only] [--max-seconds 3]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent / 'backend'
+
+# Runs inside each fresh interpreter; prints one JSON line of timings
+CHILD = """
+import asyncio, json, sys, time
+import server
+result = {"import": server.IMPORT_SECONDS}
+if sys.argv[1] == "full":
+    async def cold_start():
+        await server.app.router.startup()
+        await server.app.router.shutdown()
+    asyncio.run(cold_start())
+    result.update(server.startup_timings)
+result["total"] = time.perf_counter() - server._IMPORT_STARTED
+result["numpy_imported"] = "numpy" in sys.modules
+print(json.dumps(result))
+"""
+
+
+def run_once(mode):
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, mode], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-only", action="store_true", help="skip startup phases (no MongoDB needed)")
+    parser.add_argument("--max-seconds", type=float, help="fail if the median total exceeds this")
+    args = parser.parse_args()
+
+    results = [run_once("import" if args.import_only else "full") for _ in range(args.runs)]
+    phases = [key for key in results[0] if key != "numpy_imported"]
+    print(f"{'phase':<24}{'median':>10}{'max':>10}")
+    for phase in phases:
+        values = [result[phase] for result in results]
+        print(f"{phase:<24}{statistics.median(values):>9.3f}s{max(values):>9.3f}s")
+    if any(result["numpy_imported"] for result in results):
+        print("! numpy was imported during startup")
+
+    median_total = statistics.median(result["total"] for result in results)
+    if args.max_seconds is not None and median_total > args.max_seconds:
+        print(f"✗ Median cold start {median_total:.3f}s exceeds {args.max_seconds:.3f}s")
+        sys.exit(1)
+    print(f"✓ Median cold start {median_total:.3f}s over {args.runs} runs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Remove duplicate enrollments and build the unique enrollment index.
+
+Each (user_id, course_id) pair with more than one enrollment is folded into
+its oldest enrollment (highest progress and every completed module are
+kept), then the old non-unique index is replaced by the unique one the API
+expects. Safe to re-run.
+
+Usage:
+    python scripts/dedupe_enrollments.py [--dry-run]
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+import os
+from dotenv import load_dotenv
+
+from enrollment_dedupe import dedupe, ensure_unique_index
+
+# Load environment variables
+load_dotenv(Path(__file__).parent.parent / 'backend' / '.env')
+
+mongo_url = os.environ['MONGO_URL']
+db_name = os.environ['DB_NAME']
+
+
+async def main(dry_run: bool):
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[db_name]
+
+    summary = await dedupe(db, dry_run=dry_run)
+    verb = "Would merge" if dry_run else "Merged"
+    print(f"✓ {verb} {summary['groups']} duplicated enrollments ({summary['removed']} extra documents)")
+    if not dry_run:
+        if await ensure_unique_index(db):
+            print("✓ Unique (user_id, course_id) index in place")
+        else:
+            print("✗ Unique index still could not be built (new duplicates?); re-run the script")
+    client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--dry-run", action="store_true", help="report duplicates without changing anything")
+    asyncio.run(main(parser.parse_args().dry_run))
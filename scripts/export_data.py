@@ -0,0 +1,87 @@
+"""Export users, enrollments or progress as NDJSON or CSV.
+
+Streams from a MongoDB cursor in constant memory. Every row carries a
+`cursor` column; pass the last one written to --cursor to resume an
+interrupted export (append to the same file with --append).
+
+Usage:
+    python scripts/export_data.py progress --course-id course-1 --format csv -o progress.csv
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+import os
+from dotenv import load_dotenv
+
+from catalog import Catalog
+from export import EXPORT_FIELDS, FORMATS, ExportError, export_rows, export_text, validate
+from read_routing import routed_database
+
+# Load environment variables
+load_dotenv(Path(__file__).parent.parent / 'backend' / '.env')
+
+mongo_url = os.environ['MONGO_URL']
+db_name = os.environ['DB_NAME']
+
+
+async def export(args):
+    client = AsyncIOMotorClient(mongo_url)
+    db = routed_database(
+        client, db_name, os.environ.get('ANALYTICS_READ_PREFERENCE', 'secondaryPreferred'),
+        int(os.environ.get('READ_MAX_STALENESS_SECONDS', 90))
+    )
+
+    modules_by_course = None
+    if os.environ.get('PROGRESS_STORE', 'documents') == "bitset":
+        catalog = Catalog()
+        await catalog.ensure_fresh(db)
+        modules_by_course = catalog.modules
+
+    batches = export_rows(
+        db, args.kind, course_id=args.course_id, since=args.since, until=args.until,
+        batch_size=args.batch_size, cursor=args.cursor, modules_by_course=modules_by_course
+    )
+    out = open(args.output, "a" if args.append else "w", newline="") if args.output else sys.stdout
+    try:
+        first = True
+        async for chunk in export_text(batches, args.kind, args.format):
+            # Resuming into an existing CSV: the header is already there
+            if first and args.append and args.format == "csv":
+                first = False
+                continue
+            first = False
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("kind", choices=list(EXPORT_FIELDS))
+    parser.add_argument("--format", choices=FORMATS, default="ndjson")
+    parser.add_argument("--course-id")
+    parser.add_argument("--since", help="ISO date/time, inclusive")
+    parser.add_argument("--until", help="ISO date/time, exclusive")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--cursor", help="resume after this row cursor")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument("--append", action="store_true", help="append to --output when resuming")
+    args = parser.parse_args()
+
+    try:
+        validate(args.kind, args.format, args.cursor)
+    except ExportError as e:
+        sys.exit(str(e))
+    asyncio.run(export(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Bulk import users (e.g. from another LMS) from CSV or NDJSON.
+
+Each row needs username, email and password. Passwords are hashed across
+all cores; rows whose email or username is already taken (in the file or
+the database) or that fail validation are reported, not imported.
+
+Usage:
+    python scripts/import_users.py users.csv [--workers 8] [--failures failures.ndjson]
+"""
+import argparse
+import asyncio
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+import os
+from dotenv import load_dotenv
+
+from user_import import FORMATS, import_users, read_rows
+
+# Load environment variables
+load_dotenv(Path(__file__).parent.parent / 'backend' / '.env')
+
+mongo_url = os.environ['MONGO_URL']
+db_name = os.environ['DB_NAME']
+
+
+async def run(args, fmt):
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[db_name]
+    with open(args.file, encoding="utf-8", newline="") as f, ProcessPoolExecutor(args.workers) as executor:
+        summary = await import_users(db, read_rows(f, fmt), executor, batch_size=args.batch_size)
+    client.close()
+
+    print(f"✓ Imported {summary['imported']} users in {summary['seconds']}s "
+          f"({summary['users_per_second']} users/sec)")
+    if summary["failed"]:
+        print(f"✗ {summary['failed']} rows failed")
+        if args.failures:
+            with open(args.failures, "w", encoding="utf-8") as out:
+                for failure in summary["failures"]:
+                    out.write(json.dumps(failure) + "\n")
+            print(f"  Details written to {args.failures}")
+        else:
+            for failure in summary["failures"][:20]:
+                print(f"  line {failure['line']} ({failure['email']}): {failure['error']}")
+            if summary["failed"] > 20:
+                print(f"  ... {summary['failed'] - 20} more (use --failures to write them all)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("file")
+    parser.add_argument("--format", choices=FORMATS, help="default: from the file extension")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="hashing processes")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--failures", help="write failed rows to this NDJSON file")
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.file.endswith(".csv") else "ndjson")
+    asyncio.run(run(args, fmt))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Move inline module content into the content-addressed store.
+
+Each module's `content` is compressed into db.module_contents keyed by its
+sha256, and the module keeps only `content_hash`. Identical bodies are
+stored once. Safe to re-run: already migrated modules are skipped.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+import os
+import tempfile
+from dotenv import load_dotenv
+
+from catalog import bump_catalog_version
+from content_store import ContentStore
+
+# Load environment variables
+load_dotenv(Path(__file__).parent.parent / 'backend' / '.env')
+
+mongo_url = os.environ['MONGO_URL']
+db_name = os.environ['DB_NAME']
+
+
+async def migrate():
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[db_name]
+    store = ContentStore(db.module_contents, os.environ.get('CONTENT_CACHE_DIR', tempfile.mkdtemp()))
+
+    migrated = 0
+    stored_bytes = 0
+    async for module in db.modules.find({"content": {"$exists": True}}, {"_id": 0, "id": 1, "content": 1}):
+        digest = await store.put(module["content"])
+        await db.modules.update_one(
+            {"id": module["id"]},
+            {"$set": {"content_hash": digest}, "$unset": {"content": ""}}
+        )
+        migrated += 1
+        stored_bytes += len(module["content"].encode("utf-8"))
+
+    if migrated:
+        await bump_catalog_version(db)
+    blobs = await db.module_contents.count_documents({})
+    print(f"✓ Migrated {migrated} modules ({stored_bytes} bytes of content, {blobs} distinct blobs)")
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
@@ -0,0 +1,90 @@
+"""Migrate db.progress documents to per-enrollment completion bitsets.
+
+Folds every completed progress document into `completion_bits` /
+`completion_times` on its enrollment (see backend/completion.py) and
+recomputes the enrollment's progress percentage. The progress collection is
+left untouched; set PROGRESS_STORE=bitset once the migration has run and
+drop it when satisfied.
+
+Each enrollment is rewritten from the full set of its progress documents,
+so the script can be re-run as often as needed *before* the switch. Once
+PROGRESS_STORE=bitset is live, completions are only recorded on the
+enrollments and db.progress is stale; re-running would overwrite them, so
+the script refuses to run.
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+import os
+from dotenv import load_dotenv
+
+import completion
+
+# Load environment variables
+load_dotenv(Path(__file__).parent.parent / 'backend' / '.env')
+
+mongo_url = os.environ['MONGO_URL']
+db_name = os.environ['DB_NAME']
+
+
+async def migrate(batch_size: int):
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[db_name]
+
+    module_slots = {}
+    module_counts = {}
+    async for module in db.modules.find({}, {"_id": 0, "id": 1, "course_id": 1, "order": 1, "slot": 1}):
+        module_slots[(module["course_id"], module["id"])] = completion.slot(module)
+        module_counts[module["course_id"]] = module_counts.get(module["course_id"], 0) + 1
+
+    # (user_id, course_id) -> {slot: completed_at}
+    completed = {}
+    skipped = 0
+    cursor = db.progress.find(
+        {"completed": True}, {"_id": 0, "user_id": 1, "course_id": 1, "module_id": 1, "completed_at": 1}
+    ).batch_size(batch_size)
+    async for record in cursor:
+        slot = module_slots.get((record["course_id"], record["module_id"]))
+        if slot is None:
+            skipped += 1
+            continue
+        completed.setdefault((record["user_id"], record["course_id"]), {})[slot] = record.get("completed_at")
+    print(f"✓ Read completions for {len(completed)} enrollments ({skipped} for unknown modules skipped)")
+
+    operations = []
+    matched = 0
+    for (user_id, course_id), slots in completed.items():
+        total = module_counts.get(course_id, 0)
+        operations.append(UpdateOne(
+            {"user_id": user_id, "course_id": course_id},
+            {
+                "$set": {**completion.pack(slots), "progress": (len(slots) / total * 100) if total else 0},
+                "$currentDate": {"updated_at": True},
+            }
+        ))
+        if len(operations) >= batch_size:
+            result = await db.enrollments.bulk_write(operations, ordered=False)
+            matched += result.matched_count
+            operations = []
+    if operations:
+        result = await db.enrollments.bulk_write(operations, ordered=False)
+        matched += result.matched_count
+
+    print(f"✓ Updated {matched} enrollments ({len(completed) - matched} had no enrollment)")
+    client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    if os.environ.get('PROGRESS_STORE', 'documents') == "bitset":
+        sys.exit("✗ PROGRESS_STORE=bitset is already live; db.progress is stale and would overwrite newer completions")
+    asyncio.run(migrate(args.batch_size))
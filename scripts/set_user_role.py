@@ -0,0 +1,43 @@
+"""Grant or revoke staff access.
+
+Sets a user's `role`: "instructor" and "admin" can use the /api/admin
+routes (bulk enrollment, data export); "learner" is the signup default.
+The change applies to the user's next request; no new login is needed.
+
+Usage:
+    python scripts/set_user_role.py teacher@example.com instructor
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from motor.motor_asyncio import AsyncIOMotorClient
+import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv(Path(__file__).parent.parent / 'backend' / '.env')
+
+mongo_url = os.environ['MONGO_URL']
+db_name = os.environ['DB_NAME']
+
+ROLES = ("learner", "instructor", "admin")
+
+
+async def main(email: str, role: str):
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[db_name]
+    result = await db.users.update_one({"email": email}, {"$set": {"role": role}})
+    client.close()
+    if not result.matched_count:
+        sys.exit(f"✗ No user with email {email}")
+    print(f"✓ {email} is now {role}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("email")
+    parser.add_argument("role", choices=ROLES)
+    args = parser.parse_args()
+    asyncio.run(main(args.email, args.role))
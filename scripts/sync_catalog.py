@@ -0,0 +1,64 @@
+"""Sync the course catalog from declarative definitions.
+
+Reads scripts/catalog/courses.json (or --file) and applies only the
+courses and modules that were added, changed or removed since the last
+sync, then bumps the catalog version once so running API processes reload.
+Safe to run on every deploy.
+
+Usage:
+    python scripts/sync_catalog.py [--file path.json] [--dry-run] [--no-prune]
+"""
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+import os
+from dotenv import load_dotenv
+
+from catalog_sync import sync_catalog
+from content_store import ContentStore
+
+# Load environment variables
+load_dotenv(Path(__file__).parent.parent / 'backend' / '.env')
+
+mongo_url = os.environ['MONGO_URL']
+db_name = os.environ['DB_NAME']
+DEFAULT_CATALOG = Path(__file__).parent / 'catalog' / 'courses.json'
+
+
+async def main(args):
+    with open(args.file, encoding="utf-8") as f:
+        definitions = json.load(f)
+
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[db_name]
+    store = ContentStore(db.module_contents, os.environ.get('CONTENT_CACHE_DIR', tempfile.mkdtemp()))
+
+    summary = await sync_catalog(db, definitions, store, dry_run=args.dry_run, prune=not args.prune_disabled)
+    for name in ("courses", "modules"):
+        counts = summary[name]
+        print(f"{name}: {counts['added']} added, {counts['updated']} updated, "
+              f"{counts['removed']} removed, {counts['unchanged']} unchanged")
+    if args.dry_run:
+        print("Dry run: nothing written")
+    elif summary["version"] is None:
+        print("✓ Catalog already up to date")
+    else:
+        print(f"✓ Catalog synced (version {summary['version']})")
+    client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--file", default=str(DEFAULT_CATALOG), help="catalog definitions (JSON)")
+    parser.add_argument("--dry-run", action="store_true", help="report changes without writing")
+    parser.add_argument("--no-prune", dest="prune_disabled", action="store_true",
+                        help="keep courses/modules that are no longer defined")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,94 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "dexnote_test")
+
+import server  # noqa: E402
+from catalog import Catalog  # noqa: E402
+from content_store import ContentStore  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from leaderboard import StreakLeaderboard  # noqa: E402
+from recommendations import RecommendationTable  # noqa: E402
+
+from tests.fake_motor import FakeDatabase  # noqa: E402
+
+PASSWORD = "correct-horse"
+# bcrypt is deliberately slow; hash the shared test password once
+PASSWORD_HASH = server.get_password_hash(PASSWORD)
+
+COURSES = [
+    {"id": "course-1", "title": "Python for Beginners", "description": "Learn Python", "category": "coding",
+     "difficulty": "beginner", "duration": "6 weeks", "modules_count": 3, "created_at": "2025-01-01T00:00:00Z"},
+    {"id": "course-2", "title": "Intro to AI Tools", "description": "Use AI tools", "category": "ai-tools",
+     "difficulty": "beginner", "duration": "4 weeks", "modules_count": 1, "requires_terms": True,
+     "created_at": "2025-01-01T00:00:00Z"},
+]
+
+
+class Api:
+    def __init__(self, client, db):
+        self.client = client
+        self.db = db
+        self.learner = self._user("learner", "learner@example.com")
+        self.admin = self._user("admin", "admin@example.com", role="admin")
+
+    def _user(self, username, email, role="learner"):
+        user = server.User(username=username, email=email, role=role, streak_count=3,
+                           last_login_date=server._today_utc_date_str())
+        asyncio.run(self.db.users.insert_one({**user.model_dump(), "password_hash": PASSWORD_HASH}))
+        return {"id": user.id, "email": email, "headers": {"Authorization": f"Bearer {server.create_access_token({'sub': user.id})}"}}
+
+    def request(self, method, url, **kwargs):
+        """Issue a request and return (response, database commands it ran)."""
+        self.db.log.reset()
+        response = self.client.request(method, url, **kwargs)
+        return response, list(self.db.log.commands)
+
+
+@pytest.fixture
+def api(monkeypatch, tmp_path):
+    db = FakeDatabase()
+    store = ContentStore(db.module_contents, tmp_path / "content")
+
+    async def seed():
+        await db.courses.insert_many([dict(course) for course in COURSES])
+        await db.modules.insert_many([
+            {"id": "module-1-1", "course_id": "course-1", "title": "Intro", "order": 1,
+             "content_hash": await store.put("Welcome to Python")},
+            {"id": "module-1-2", "course_id": "course-1", "title": "Variables", "order": 2,
+             "content_hash": await store.put("Variables hold values")},
+            {"id": "module-1-3", "course_id": "course-1", "title": "Loops", "order": 3, "content": "Loop over things"},
+            {"id": "module-2-1", "course_id": "course-2", "title": "Prompts", "order": 1,
+             "content_hash": await store.put("Write good prompts")},
+        ])
+
+    asyncio.run(seed())
+
+    async def no_background_jobs():
+        pass
+
+    monkeypatch.setattr(server, "db", db)
+    monkeypatch.setattr(server, "catalog_db", db)
+    monkeypatch.setattr(server, "analytics_db", db)
+    monkeypatch.setattr(server, "content_store", store)
+    # Never poll the catalog version mid-test; startup loads it once
+    monkeypatch.setattr(server, "catalog", Catalog(refresh_seconds=float("inf")))
+    monkeypatch.setattr(server, "streak_leaderboard", StreakLeaderboard())
+    monkeypatch.setattr(server, "course_recommendations", RecommendationTable())
+    monkeypatch.setattr(server, "_recommendations_job", no_background_jobs)
+
+    with TestClient(server.app) as client:
+        api = Api(client, db)
+        response = client.post("/api/enrollments", json={"course_id": "course-1"}, headers=api.learner["headers"])
+        assert response.status_code == 200, response.text
+        response = client.put("/api/progress", headers=api.learner["headers"],
+                              json={"module_id": "module-1-1", "course_id": "course-1", "completed": True})
+        assert response.status_code == 200, response.text
+        yield api
@@ -0,0 +1,463 @@
+"""In-memory stand-in for the subset of Motor that backend/server.py uses.
+
+Every call that would be a MongoDB command is appended to a shared
+`CommandLog`, together with whether an index could serve its filter. Indexes
+are whatever the application creates through `create_index`, so the tests
+check the real index set rather than a copy of it.
+"""
+import copy
+from datetime import datetime, timezone
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import DeleteMany, ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+
+_MISSING = object()
+
+
+@dataclass
+class Command:
+    collection: str
+    name: str
+    filter: Optional[dict] = None
+    indexed: bool = True
+
+    def __str__(self):
+        scan = "" if self.indexed else " [COLLSCAN]"
+        return f"{self.collection}.{self.name}({self.filter}){scan}"
+
+
+@dataclass
+class CommandLog:
+    commands: List[Command] = field(default_factory=list)
+
+    def reset(self):
+        self.commands = []
+
+
+# ----- query / update evaluation -----
+
+def _get(doc, path):
+    value = doc
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _set(doc, path, value):
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.setdefault(part, {})
+    doc[parts[-1]] = value
+
+
+def _unset(doc, path):
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.get(part)
+        if not isinstance(doc, dict):
+            return
+    doc.pop(parts[-1], None)
+
+
+def _equals(value, expected):
+    if isinstance(value, list) and not isinstance(expected, list):
+        return expected in value
+    return value is not _MISSING and value == expected
+
+
+def _naive_utc(value):
+    # Like the driver: aware datetimes are stored and compared as naive UTC
+    if isinstance(value, datetime) and value.tzinfo:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+_BSON_TYPES = {"date": datetime, "string": str, "objectId": ObjectId, "null": type(None)}
+
+
+def _compare(value, op, operand):
+    value, operand = _naive_utc(value), _naive_utc(operand)
+    if op == "$not":
+        return not all(_compare(value, inner, inner_operand) for inner, inner_operand in operand.items())
+    if op == "$type":
+        return value is not _MISSING and isinstance(value, _BSON_TYPES[operand])
+    if op == "$eq":
+        return _equals(value, operand)
+    if op == "$ne":
+        return not _equals(value, operand)
+    if op == "$in":
+        return any(_equals(value, item) for item in operand)
+    if op == "$nin":
+        return not any(_equals(value, item) for item in operand)
+    if op == "$exists":
+        return (value is not _MISSING) == bool(operand)
+    if value is _MISSING or value is None:
+        return False
+    # Range queries only match values of the same BSON type
+    if isinstance(value, datetime) != isinstance(operand, datetime) or isinstance(value, str) != isinstance(operand, str):
+        return False
+    if op == "$gt":
+        return value > operand
+    if op == "$gte":
+        return value >= operand
+    if op == "$lt":
+        return value < operand
+    if op == "$lte":
+        return value <= operand
+    raise NotImplementedError(f"query operator {op}")
+
+
+def matches(doc, query) -> bool:
+    for key, condition in (query or {}).items():
+        if key == "$or":
+            if not any(matches(doc, branch) for branch in condition):
+                return False
+        elif key == "$and":
+            if not all(matches(doc, branch) for branch in condition):
+                return False
+        elif isinstance(condition, dict) and condition and all(k.startswith("$") for k in condition):
+            value = _get(doc, key)
+            if not all(_compare(value, op, operand) for op, operand in condition.items()):
+                return False
+        elif not _equals(_naive_utc(_get(doc, key)), _naive_utc(condition)):
+            return False
+    return True
+
+
+def apply_update(doc, update, inserting=False):
+    if not any(key.startswith("$") for key in update):
+        _id = doc.get("_id")
+        doc.clear()
+        doc.update(copy.deepcopy(update))
+        if _id is not None:
+            doc["_id"] = _id
+        return
+    for op, fields in update.items():
+        for path, value in fields.items():
+            if op == "$set" or (op == "$setOnInsert" and inserting):
+                _set(doc, path, copy.deepcopy(value))
+            elif op == "$unset":
+                _unset(doc, path)
+            elif op == "$inc":
+                current = _get(doc, path)
+                _set(doc, path, (0 if current is _MISSING else current) + value)
+            elif op == "$max":
+                current = _get(doc, path)
+                if current is _MISSING or value > current:
+                    _set(doc, path, copy.deepcopy(value))
+            elif op == "$currentDate":
+                now = datetime.now(timezone.utc).replace(tzinfo=None)
+                _set(doc, path, now.replace(microsecond=now.microsecond // 1000 * 1000))
+            elif op == "$bit":
+                current = _get(doc, path)
+                current = 0 if current is _MISSING else current
+                for bit_op, operand in value.items():
+                    current = {"and": current & operand, "or": current | operand, "xor": current ^ operand}[bit_op]
+                _set(doc, path, current)
+            elif op != "$setOnInsert":
+                raise NotImplementedError(f"update operator {op}")
+
+
+def project(doc, projection):
+    doc = copy.deepcopy(doc)
+    if not projection:
+        return doc
+    include = [key for key, flag in projection.items() if flag and key != "_id"]
+    if include:
+        result = {key: doc[key] for key in include if key in doc}
+        if projection.get("_id", 1) and "_id" in doc:
+            result["_id"] = doc["_id"]
+        return result
+    for key, flag in projection.items():
+        if not flag:
+            doc.pop(key, None)
+    return doc
+
+
+def _sort_key(doc, sort):
+    key = []
+    for path, direction in sort:
+        value = _get(doc, path)
+        missing = value is _MISSING or value is None
+        key.append((missing, _Reversed(value) if direction < 0 and not missing else (None if missing else value)))
+    return key
+
+
+class _Reversed:
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return self.value > other.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+# ----- Motor-shaped classes -----
+
+class FakeCursor:
+    def __init__(self, collection, query, projection):
+        self._collection = collection
+        self._query = query
+        self._projection = projection
+        self._sort: List[Tuple[str, int]] = []
+        self._limit = 0
+
+    def sort(self, key, direction=1):
+        self._sort = list(key) if isinstance(key, list) else [(key, direction)]
+        return self
+
+    def limit(self, limit):
+        self._limit = limit
+        return self
+
+    def batch_size(self, _):
+        return self
+
+    def _results(self):
+        self._collection._record("find", self._query, self._sort)
+        docs = [doc for doc in self._collection._docs if matches(doc, self._query)]
+        if self._sort:
+            docs.sort(key=lambda doc: _sort_key(doc, self._sort))
+        if self._limit:
+            docs = docs[:self._limit]
+        return [project(doc, self._projection) for doc in docs]
+
+    async def to_list(self, length=None):
+        results = self._results()
+        return results[:length] if length else results
+
+    def __aiter__(self):
+        async def iterate():
+            for doc in self._results():
+                yield doc
+        return iterate()
+
+
+class _Result:
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+
+class FakeCollection:
+    def __init__(self, name: str, log: CommandLog):
+        self.name = name
+        self._log = log
+        self._docs: List[dict] = []
+        # Each index: (tuple of key names, unique)
+        self.indexes: List[Tuple[Tuple[str, ...], bool]] = [(("_id",), True)]
+
+    def _uses_index(self, query, sort) -> bool:
+        query = query or {}
+        if "$or" in query:
+            rest = {k: v for k, v in query.items() if k != "$or"}
+            return (rest and self._uses_index(rest, None)) or all(
+                self._uses_index(branch, None) for branch in query["$or"]
+            )
+        fields = {key for key in query if not key.startswith("$")}
+        leading = {keys[0] for keys, _ in self.indexes}
+        if fields & leading:
+            return True
+        # An unfiltered walk in index order (e.g. sort by _id) is an index scan, not a collection scan
+        return not fields and bool(sort) and sort[0][0] in leading
+
+    def _record(self, name, query=None, sort=None, check=True):
+        self._log.commands.append(Command(
+            self.name, name, query, self._uses_index(query, sort) if check else True
+        ))
+
+    def _check_unique(self, doc, ignore=None):
+        for keys, unique in self.indexes:
+            if not unique:
+                continue
+            value = tuple(_get(doc, key) for key in keys)
+            for other in self._docs:
+                if other is not ignore and other is not doc and tuple(_get(other, key) for key in keys) == value:
+                    raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} index: {keys}")
+
+    # --- writes ---
+
+    async def create_index(self, keys, unique=False, **_):
+        self._record("createIndexes", check=False)
+        keys = (keys,) if isinstance(keys, str) else tuple(key for key, _ in keys)
+        for existing, existing_unique in self.indexes:
+            if existing == keys:
+                if existing_unique != unique:
+                    raise OperationFailure("Index already exists with different options", code=85)
+                return
+        if unique:
+            seen = set()
+            for doc in self._docs:
+                value = tuple(repr(_get(doc, key)) for key in keys)
+                if value in seen:
+                    raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} index: {keys}")
+                seen.add(value)
+        self.indexes.append((keys, unique))
+
+    @staticmethod
+    def _index_name(keys):
+        return "_id_" if keys == ("_id",) else "_".join(f"{key}_1" for key in keys)
+
+    async def index_information(self):
+        self._record("listIndexes", check=False)
+        info = {}
+        for keys, unique in self.indexes:
+            info[self._index_name(keys)] = {"key": [(key, 1) for key in keys], **({"unique": True} if unique else {})}
+        return info
+
+    async def drop_index(self, name):
+        self._record("dropIndexes", check=False)
+        for index in self.indexes:
+            if self._index_name(index[0]) == name and name != "_id_":
+                self.indexes.remove(index)
+                return
+        raise OperationFailure(f"index not found with name [{name}]", code=27)
+
+    def _insert(self, doc):
+        doc.setdefault("_id", ObjectId())
+        stored = copy.deepcopy(doc)
+        self._check_unique(stored)
+        self._docs.append(stored)
+        return doc["_id"]
+
+    async def insert_one(self, doc):
+        self._record("insert", check=False)
+        return _Result(inserted_id=self._insert(doc))
+
+    async def insert_many(self, docs, ordered=True):
+        self._record("insert", check=False)
+        return _Result(inserted_ids=[self._insert(doc) for doc in docs])
+
+    def _update(self, query, update, upsert=False, many=False):
+        matched = [doc for doc in self._docs if matches(doc, query)]
+        if not many:
+            matched = matched[:1]
+        for doc in matched:
+            before = copy.deepcopy(doc)
+            apply_update(doc, update)
+            try:
+                self._check_unique(doc)
+            except DuplicateKeyError:
+                doc.clear()
+                doc.update(before)
+                raise
+        upserted_id = None
+        if not matched and upsert:
+            doc = {
+                key: value for key, value in query.items()
+                if not key.startswith("$") and not isinstance(value, dict)
+            }
+            apply_update(doc, update, inserting=True)
+            upserted_id = self._insert(doc)
+        return len(matched), upserted_id
+
+    async def update_one(self, query, update, upsert=False):
+        self._record("update", query)
+        matched, upserted_id = self._update(query, update, upsert)
+        return _Result(matched_count=matched, modified_count=matched, upserted_id=upserted_id)
+
+    async def update_many(self, query, update, upsert=False):
+        self._record("update", query)
+        matched, upserted_id = self._update(query, update, upsert, many=True)
+        return _Result(matched_count=matched, modified_count=matched, upserted_id=upserted_id)
+
+    async def find_one_and_update(self, query, update, projection=None, upsert=False, return_document=False, **_):
+        self._record("findAndModify", query)
+        before = next((copy.deepcopy(doc) for doc in self._docs if matches(doc, query)), None)
+        _, upserted_id = self._update(query, update, upsert)
+        if not return_document:
+            return project(before, projection) if before else None
+        _id = before["_id"] if before else upserted_id
+        after = next((doc for doc in self._docs if doc["_id"] == _id), None) if _id is not None else None
+        return project(after, projection) if after else None
+
+    async def delete_many(self, query):
+        self._record("delete", query)
+        before = len(self._docs)
+        self._docs = [doc for doc in self._docs if not matches(doc, query)]
+        return _Result(deleted_count=before - len(self._docs))
+
+    async def bulk_write(self, requests, ordered=True):
+        # One command on the wire; each statement's filter still has to be indexed
+        self._log.commands.append(Command(
+            self.name, "bulkWrite", None,
+            all(self._uses_index(request._filter, None) for request in requests)
+        ))
+        upserted, errors, matched, deleted = [], [], 0, 0
+        for index, request in enumerate(requests):
+            if isinstance(request, DeleteMany):
+                before = len(self._docs)
+                self._docs = [doc for doc in self._docs if not matches(doc, request._filter)]
+                deleted += before - len(self._docs)
+                continue
+            if not isinstance(request, (UpdateOne, ReplaceOne)):
+                raise NotImplementedError(type(request).__name__)
+            try:
+                count, upserted_id = self._update(request._filter, request._doc, request._upsert)
+            except DuplicateKeyError as e:
+                errors.append({"index": index, "code": 11000, "errmsg": str(e)})
+                if ordered:
+                    break
+                continue
+            matched += count
+            if upserted_id is not None:
+                upserted.append({"index": index, "_id": upserted_id})
+        result = {"nMatched": matched, "nRemoved": deleted, "upserted": upserted, "writeErrors": errors}
+        if errors:
+            raise BulkWriteError(result)
+        return _Result(bulk_api_result=result, matched_count=matched, upserted_count=len(upserted))
+
+    # --- reads ---
+
+    async def find_one(self, query=None, projection=None, session=None):
+        self._record("find", query)
+        doc = next((doc for doc in self._docs if matches(doc, query)), None)
+        return project(doc, projection) if doc else None
+
+    def find(self, query=None, projection=None, session=None):
+        return FakeCursor(self, query or {}, projection)
+
+    async def count_documents(self, query):
+        self._record("count", query)
+        return sum(1 for doc in self._docs if matches(doc, query))
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeClient:
+    # Sessions are client-side bookkeeping; starting one is not a command
+    async def start_session(self, **_):
+        return FakeSession()
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.log = CommandLog()
+        self.client = FakeClient()
+        self._collections: Dict[str, FakeCollection] = {}
+
+    def __getitem__(self, name) -> FakeCollection:
+        if name not in self._collections:
+            self._collections[name] = FakeCollection(name, self.log)
+        return self._collections[name]
+
+    def __getattr__(self, name) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    async def command(self, name, **_):
+        self.log.commands.append(Command("$cmd", name))
+        return {"ok": 1.0}
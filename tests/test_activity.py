@@ -0,0 +1,48 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+
+import activity
+from tests.conftest import PASSWORD
+
+
+def _docs(days):
+    return [
+        {"_id": f"u:{year}", "user_id": "u", "year": year, "days": words}
+        for year, words in activity.pack(days).items()
+    ]
+
+
+def test_streak_across_new_year():
+    days = [date(2025, 12, 30), date(2025, 12, 31), date(2026, 1, 1), date(2026, 1, 2)]
+    docs = _docs(days)
+    assert len(docs) == 2
+    assert activity.active_days(docs) == days
+    assert activity.streaks(docs, date(2026, 1, 2)) == (4, 4)
+
+
+def test_empty_history():
+    assert activity.active_days([]) == []
+    assert activity.streaks([], date(2026, 1, 2)) == (0, 0)
+
+
+def test_current_streak_alive_until_a_full_day_is_missed():
+    docs = _docs([date(2026, 3, 1), date(2026, 3, 2), date(2026, 3, 3)] + [date(2026, 2, day) for day in range(1, 8)])
+    assert activity.streaks(docs, date(2026, 3, 3)) == (3, 7)  # active today
+    assert activity.streaks(docs, date(2026, 3, 4)) == (3, 7)  # today not yet active, yesterday was
+    assert activity.streaks(docs, date(2026, 3, 5)) == (0, 7)  # lapsed
+
+
+def test_activity_reflects_login_and_completion(api):
+    today = datetime.now(timezone.utc).date()
+    yesterday = today - timedelta(days=1)
+    query, update = activity.record(api.learner["id"], yesterday)
+    asyncio.run(api.db.activity.update_one(query, update, upsert=True))
+
+    response = api.client.post("/api/auth/login", json={"email": api.learner["email"], "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    api.client.put("/api/progress", headers=api.learner["headers"],
+                   json={"module_id": "module-1-2", "course_id": "course-1", "completed": True})
+
+    body = api.client.get("/api/activity", headers=api.learner["headers"]).json()
+    assert body["active_days"] == [yesterday.isoformat(), today.isoformat()]
+    assert body["current_streak"] == body["longest_streak"] == 2
@@ -0,0 +1,97 @@
+import asyncio
+import sys
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import activity  # noqa: E402
+import analytics  # noqa: E402
+
+from tests.fake_motor import FakeDatabase  # noqa: E402
+
+
+def test_migrated_completions_are_counted_once():
+    db = FakeDatabase()
+    asyncio.run(db.progress.insert_many([
+        {"user_id": "a", "completed": True, "completed_at": "2026-01-02T10:00:00+00:00"},
+        {"user_id": "b", "completed": True, "completed_at": "2026-01-03T10:00:00+00:00"},
+    ]))
+    # The bitset migration copies completions onto enrollments and leaves db.progress behind
+    asyncio.run(db.enrollments.insert_many([
+        {"user_id": "a", "completion_times": {"1": "2026-01-02T10:00:00+00:00", "2": "2026-01-05T08:00:00+00:00"}},
+        {"user_id": "b", "completion_times": {"1": "2026-01-03T10:00:00+00:00"}},
+    ]))
+    users = pd.Index(["a", "b"])
+
+    days, completions = asyncio.run(analytics.load_activity(db, users, 1))
+    assert completions.tolist() == [1, 1]
+    assert len(days) == 2
+
+    days, completions = asyncio.run(analytics.load_activity(db, users, 1, "bitset"))
+    assert completions.tolist() == [2, 1]
+    assert len(days) == 3
+
+
+def _users(signup_days, last_login_days, streaks=None):
+    return pd.DataFrame({
+        "signup_day": np.array(signup_days, dtype="float32"),
+        "streak_count": np.array(streaks or [0] * len(signup_days), dtype="int32"),
+        "last_login_day": np.array(last_login_days, dtype="float32"),
+    })
+
+
+def _day(value):
+    return (date.fromisoformat(value) - date(1970, 1, 1)).days
+
+
+def test_active_days_come_from_the_activity_bitmaps():
+    db = FakeDatabase()
+    for user_id, day in (("a", "2025-12-31"), ("a", "2026-01-01"), ("b", "2026-01-03"), ("ghost", "2026-01-03")):
+        query, update = activity.record(user_id, date.fromisoformat(day))
+        asyncio.run(db.activity.update_one(query, update, upsert=True))
+
+    days = asyncio.run(analytics.load_active_days(db, pd.Index(["a", "b"]), 1))
+    assert sorted(map(tuple, days[["user", "day"]].to_numpy().tolist())) == [
+        (0, _day("2025-12-31")), (0, _day("2026-01-01")), (1, _day("2026-01-03"))
+    ]
+
+
+def test_cohort_retention_counts_every_active_day():
+    monday = _day("2026-01-05")
+    # User 0 was active on days 1-6 but last logged in on day 40; user 1 never came back
+    users = _users([monday, monday], [monday + 40, monday])
+    days = pd.DataFrame({"user": [0] * 6, "day": [monday + offset for offset in range(1, 7)]}, dtype="int32")
+
+    report = analytics.cohort_retention(users, days, weeks=2)
+    assert report.to_dict("records") == [{
+        "signup_week": date(2026, 1, 5), "users": 2, "retained_d7": 0.5, "week_0": 1.0, "week_1": 0.0,
+    }]
+
+
+def test_completion_funnel():
+    enrollments = pd.DataFrame({
+        "user": [0, 1, 2, 0],
+        "course_id": pd.Categorical(["py", "py", "py", "ai"]),
+        "progress": np.array([0, 50, 100, 100], dtype="float32"),
+    })
+    funnel = analytics.completion_funnel(enrollments).set_index("course_id")
+    assert funnel.loc["py", ["enrolled", "started", "halfway", "completed"]].tolist() == [3, 2, 2, 1]
+    assert funnel.loc["py", "completion_rate"] == 1 / 3
+    assert funnel.loc["ai", "completion_rate"] == 1.0
+
+
+def test_streak_distribution_zeroes_lapsed_streaks():
+    today = _day("2026-03-10")
+    users = _users([0, 0, 0], [today, today - 1, today - 5], streaks=[5, 1, 20])
+    enrollments = pd.DataFrame({"user": [0, 0, 1], "progress": np.array([100, 100, 40], dtype="float32")})
+
+    report, correlation = analytics.streak_distribution(users, enrollments, np.array([8, 1, 30]), today)
+    buckets = report.set_index("streak_bucket")
+    assert buckets["users"].to_dict() == {"0": 1, "1": 1, "2-3": 0, "4-7": 1, "8-14": 0, "15-30": 0, "31+": 0}
+    assert buckets.loc["4-7", "mean_courses_completed"] == 2
+    assert buckets.loc["0", "mean_modules_completed"] == 30
+    assert correlation > 0
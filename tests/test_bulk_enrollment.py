@@ -0,0 +1,49 @@
+import json
+
+import server
+
+URL = "/api/admin/enrollments/bulk"
+
+
+def _request(api, **overrides):
+    return {
+        "user_ids": [api.learner["id"], api.admin["id"]],
+        # The learner again, by email, and someone who does not exist
+        "emails": [api.learner["email"], "nobody@example.com"],
+        "course_ids": ["course-1"],
+        **overrides,
+    }
+
+
+def _statuses(results):
+    return sorted((result["user"], result["status"]) for result in results)
+
+
+def test_one_outcome_per_user_and_course(api):
+    response = api.client.post(URL, headers=api.admin["headers"], json=_request(api))
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert _statuses(body["results"]) == sorted([
+        (api.learner["id"], "already_enrolled"),
+        (api.admin["id"], "enrolled"),
+        ("nobody@example.com", "user_not_found"),
+    ])
+    assert body["summary"] == {"already_enrolled": 1, "enrolled": 1, "user_not_found": 1}
+
+
+def test_users_named_twice_across_streamed_batches(api, monkeypatch):
+    monkeypatch.setattr(server, "BULK_ENROLLMENT_BATCH", 1)
+    response = api.client.post(f"{URL}?stream=true", headers=api.admin["headers"], json=_request(api))
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    results = [result for line in lines[:-1] for result in line["results"]]
+    assert _statuses(results) == sorted([
+        (api.learner["id"], "already_enrolled"),
+        (api.admin["id"], "enrolled"),
+        ("nobody@example.com", "user_not_found"),
+    ])
+    assert lines[-1] == {"done": True, "summary": {"already_enrolled": 1, "enrolled": 1, "user_not_found": 1}}
+
+
+def test_bulk_enrollment_is_staff_only(api):
+    response = api.client.post(URL, headers=api.learner["headers"], json=_request(api))
+    assert response.status_code == 403
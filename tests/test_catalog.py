@@ -0,0 +1,67 @@
+import asyncio
+
+from catalog import Catalog, bump_catalog_version
+
+from tests.fake_motor import FakeDatabase
+
+COURSES = [
+    {"id": "py", "title": "Python Basics", "category": "coding", "difficulty": "beginner"},
+    {"id": "pyx", "title": "Python Performance", "category": "coding", "difficulty": "advanced", "requires_terms": True},
+    {"id": "js", "title": "JavaScript", "category": "coding", "difficulty": "beginner"},
+    {"id": "ai", "title": "Prompting", "category": "ai-tools", "difficulty": "beginner"},
+    {"id": "design", "title": "Design Systems", "category": "design", "difficulty": "intermediate"},
+]
+
+
+def _catalog(courses=COURSES):
+    db = FakeDatabase()
+    asyncio.run(db.courses.insert_many([dict(course) for course in courses]))
+    asyncio.run(bump_catalog_version(db))
+    catalog = Catalog(refresh_seconds=0)
+    asyncio.run(catalog.ensure_fresh(db))
+    return db, catalog
+
+
+def _ids(courses):
+    return [course["id"] for course in courses]
+
+
+def test_values_within_a_field_are_ored():
+    _, catalog = _catalog()
+    courses, _ = catalog.search({"category": ["ai-tools", "design"]})
+    assert _ids(courses) == ["ai", "design"]
+    courses, _ = catalog.search({"category": ["coding", "design"], "difficulty": ["beginner"]})
+    assert _ids(courses) == ["py", "js"]
+
+
+def test_facets_ignore_their_own_filter():
+    _, catalog = _catalog()
+    _, facets = catalog.search({"category": ["coding"]})
+    # Other categories still show what selecting them would add
+    assert facets["category"] == {"coding": 3, "ai-tools": 1, "design": 1}
+    # Other fields are narrowed to the selected category
+    assert facets["difficulty"] == {"beginner": 2, "advanced": 1, "intermediate": 0}
+
+
+def test_requires_terms_defaults_to_false():
+    _, catalog = _catalog()
+    courses, facets = catalog.search({"requires_terms": [False]})
+    assert _ids(courses) == ["py", "js", "ai", "design"]
+    assert facets["requires_terms"] == {False: 4, True: 1}
+
+
+def test_title_prefix():
+    _, catalog = _catalog()
+    assert _ids(catalog.search({}, "pyth")[0]) == ["py", "pyx"]
+    assert _ids(catalog.search({"difficulty": ["advanced"]}, "Python")[0]) == ["pyx"]
+    assert catalog.search({}, "zzz")[0] == []
+
+
+def test_reload_invalidates_memoized_searches():
+    db, catalog = _catalog()
+    assert _ids(catalog.search({"category": ["design"]})[0]) == ["design"]
+
+    asyncio.run(db.courses.insert_one({"id": "ux", "title": "UX Research", "category": "design"}))
+    asyncio.run(bump_catalog_version(db))
+    asyncio.run(catalog.ensure_fresh(db))
+    assert _ids(catalog.search({"category": ["design"]})[0]) == ["design", "ux"]
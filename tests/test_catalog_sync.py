@@ -0,0 +1,89 @@
+import asyncio
+import copy
+import json
+from pathlib import Path
+
+from catalog_sync import sync_catalog
+from content_store import ContentStore
+
+from tests.fake_motor import FakeDatabase
+
+CATALOG = json.loads((Path(__file__).parent.parent / "scripts" / "catalog" / "courses.json").read_text())
+
+
+def _sync(db, store, definitions):
+    db.log.reset()
+    return asyncio.run(sync_catalog(db, definitions, store))
+
+
+def _writes(db):
+    return [command for command in db.log.commands if command.name in ("bulkWrite", "findAndModify")]
+
+
+def test_sync_writes_only_changes(tmp_path):
+    db = FakeDatabase()
+    store = ContentStore(db.module_contents, tmp_path)
+
+    summary = _sync(db, store, CATALOG)
+    assert summary["courses"]["added"] == len(CATALOG["courses"])
+    assert summary["version"] == 1
+
+    # Unchanged catalog: no writes, no version bump
+    summary = _sync(db, store, CATALOG)
+    assert summary["version"] is None
+    assert _writes(db) == []
+
+    changed = copy.deepcopy(CATALOG)
+    changed["courses"][0]["modules"][0]["content"] += "\nNew exercise."
+    removed = changed["courses"].pop()
+    summary = _sync(db, store, changed)
+    assert summary["modules"] == {
+        "added": 0, "updated": 1, "removed": len(removed["modules"]),
+        "unchanged": sum(len(c["modules"]) for c in changed["courses"]) - 1,
+    }
+    assert summary["courses"]["removed"] == 1
+    assert summary["version"] == 2
+    assert asyncio.run(db.courses.find_one({"id": removed["id"]})) is None
+
+
+def _slots(db):
+    return {doc["id"]: doc["slot"] for doc in asyncio.run(db.modules.find({}).to_list(None))}
+
+
+def test_module_slots_survive_reordering(tmp_path):
+    db = FakeDatabase()
+    store = ContentStore(db.module_contents, tmp_path)
+    _sync(db, store, CATALOG)
+    before = _slots(db)
+
+    changed = copy.deepcopy(CATALOG)
+    course = changed["courses"][0]
+    dropped = course["modules"].pop()
+    course["modules"].reverse()
+    course["modules"].insert(0, {**course["modules"][0], "id": "inserted-module", "title": "Inserted"})
+    for order, module in enumerate(course["modules"], start=1):
+        module["order"] = order
+    _sync(db, store, changed)
+
+    after = _slots(db)
+    assert {module_id: after[module_id] for module_id in after if module_id != "inserted-module"} == {
+        module_id: slot for module_id, slot in before.items() if module_id != dropped["id"]
+    }
+    # Fresh slot, even though the dropped module's slot is free again
+    course_slots = [before[module["id"]] for module in CATALOG["courses"][0]["modules"]]
+    assert after["inserted-module"] == max(course_slots) + 1
+
+
+def test_legacy_modules_keep_order_as_slot(tmp_path):
+    db = FakeDatabase()
+    store = ContentStore(db.module_contents, tmp_path)
+    _sync(db, store, CATALOG)
+    asyncio.run(db.modules.update_many({}, {"$unset": {"slot": ""}}))
+    orders = {doc["id"]: doc["order"] for doc in asyncio.run(db.modules.find({}).to_list(None))}
+
+    reordered = copy.deepcopy(CATALOG)
+    for course in reordered["courses"]:
+        for module in course["modules"]:
+            module["order"] += 10
+    _sync(db, store, reordered)
+    assert _slots(db) == orders
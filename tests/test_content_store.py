@@ -0,0 +1,38 @@
+import asyncio
+import logging
+
+import server
+from content_store import ContentStore
+
+from tests.fake_motor import FakeDatabase
+
+
+def test_misses_fall_back_to_primary(tmp_path):
+    primary, secondary = FakeDatabase(), FakeDatabase()
+    digest = asyncio.run(ContentStore(primary.module_contents, tmp_path / "writer").put("Fresh lesson"))
+
+    # The secondary has not replicated the blob yet
+    store = ContentStore(secondary.module_contents, tmp_path / "reader", primary=primary.module_contents)
+    assert asyncio.run(store.get_many([digest])) == {digest: "Fresh lesson"}
+
+    # Now cached on disk: no further reads at all
+    primary.log.reset()
+    secondary.log.reset()
+    assert asyncio.run(store.get_many([digest])) == {digest: "Fresh lesson"}
+    assert primary.log.commands == secondary.log.commands == []
+
+
+def test_missing_blob_is_logged_not_blank(tmp_path, caplog):
+    store = ContentStore(FakeDatabase().module_contents, tmp_path)
+    with caplog.at_level(logging.ERROR, logger="content_store"):
+        assert asyncio.run(store.get_many(["0" * 64])) == {}
+    assert "0" * 64 in caplog.text
+
+
+def test_module_route_refuses_missing_content(api):
+    asyncio.run(api.db.module_contents.delete_many({}))
+    for path in server.content_store.cache_dir.rglob("*"):
+        if path.is_file():
+            path.unlink()
+    response = api.client.get("/api/courses/course-1/modules")
+    assert response.status_code == 503
@@ -0,0 +1,121 @@
+"""Database round-trip budgets for every API route.
+
+Each route declares how many MongoDB commands one request may issue
+(including the `get_current_user` lookup on authenticated routes). A request
+that goes over budget, or whose filter no index can serve, fails the suite.
+Adding a route means adding its budget here.
+"""
+import pytest
+from fastapi.routing import APIRoute
+
+import server
+
+BUDGETS = {
+    ("GET", "/api/health"): 0,
+    ("POST", "/api/auth/signup"): 3,
+    # Logins and module completions also mark the day in the activity bitmap
+    ("POST", "/api/auth/login"): 3,
+    ("GET", "/api/auth/me"): 1,
+    ("GET", "/api/streak"): 1,
+    ("GET", "/api/leaderboard/streaks"): 1,
+    ("GET", "/api/activity"): 2,
+    ("GET", "/api/courses"): 0,
+    ("GET", "/api/courses/{course_id}"): 0,
+    # Modules not yet in the content store cost one inline-content query
+    ("GET", "/api/courses/{course_id}/modules"): 1,
+    ("POST", "/api/enrollments"): 3,
+    ("GET", "/api/enrollments/my"): 2,
+    ("PUT", "/api/progress"): 5,
+    ("GET", "/api/progress/course/{course_id}"): 2,
+    ("GET", "/api/recommendations"): 2,
+    # A full sync also pages through records written before server-side stamps
+    ("GET", "/api/sync"): 5,
+    ("POST", "/api/admin/enrollments/bulk"): 3,
+    ("GET", "/api/admin/export"): 2,
+    ("GET", "/api/profile"): 1,
+    ("PUT", "/api/profile"): 5,
+}
+
+PROGRESS_UPDATE = {"module_id": "module-1-2", "course_id": "course-1", "completed": True}
+
+# (route, url, request kwargs, user) -- user is "learner", "admin" or None
+CASES = [
+    (("GET", "/api/health"), "/api/health", {}, None),
+    (("POST", "/api/auth/signup"), "/api/auth/signup",
+     {"json": {"username": "newbie", "email": "newbie@example.com", "password": "pw"}}, None),
+    (("POST", "/api/auth/login"), "/api/auth/login",
+     {"json": {"email": "learner@example.com", "password": "correct-horse"}}, None),
+    (("GET", "/api/auth/me"), "/api/auth/me", {}, "learner"),
+    (("GET", "/api/streak"), "/api/streak", {}, "learner"),
+    (("GET", "/api/leaderboard/streaks"), "/api/leaderboard/streaks", {}, "learner"),
+    (("GET", "/api/activity"), "/api/activity", {}, "learner"),
+    (("GET", "/api/courses"), "/api/courses", {}, None),
+    (("GET", "/api/courses"), "/api/courses?category=coding&difficulty=beginner&q=py&facets=true", {}, None),
+    (("GET", "/api/courses/{course_id}"), "/api/courses/course-1", {}, None),
+    (("GET", "/api/courses/{course_id}/modules"), "/api/courses/course-1/modules", {}, None),
+    (("POST", "/api/enrollments"), "/api/enrollments",
+     {"json": {"course_id": "course-2", "terms_accepted": True}}, "learner"),
+    (("GET", "/api/enrollments/my"), "/api/enrollments/my", {}, "learner"),
+    (("PUT", "/api/progress"), "/api/progress", {"json": PROGRESS_UPDATE}, "learner"),
+    (("GET", "/api/progress/course/{course_id}"), "/api/progress/course/course-1", {}, "learner"),
+    (("GET", "/api/recommendations"), "/api/recommendations", {}, "learner"),
+    (("GET", "/api/sync"), "/api/sync", {}, "learner"),
+    (("POST", "/api/admin/enrollments/bulk"), "/api/admin/enrollments/bulk",
+     {"json": {"emails": ["learner@example.com", "admin@example.com"], "course_ids": ["course-1"]}}, "admin"),
+    (("POST", "/api/admin/enrollments/bulk"), "/api/admin/enrollments/bulk?stream=true",
+     {"json": {"emails": ["learner@example.com"], "course_ids": ["course-1"]}}, "admin"),
+    (("GET", "/api/admin/export"), "/api/admin/export?kind=enrollments&course_id=course-1&format=csv", {}, "admin"),
+    (("GET", "/api/profile"), "/api/profile", {}, "learner"),
+    (("PUT", "/api/profile"), "/api/profile", {"json": {"username": "renamed", "email": "renamed@example.com"}}, "learner"),
+]
+
+
+def _check(response, commands, budget):
+    assert response.status_code < 400, response.text
+    trace = "\n  ".join(str(command) for command in commands)
+    assert len(commands) <= budget, f"{len(commands)} commands, budget {budget}:\n  {trace}"
+    unindexed = [command for command in commands if not command.indexed]
+    assert not unindexed, f"unindexed scan:\n  {trace}"
+
+
+def test_every_route_declares_a_budget():
+    routes = {
+        (method, route.path)
+        for route in server.api_router.routes if isinstance(route, APIRoute)
+        for method in route.methods
+    }
+    assert routes - set(BUDGETS) == set()
+    assert {route for route, *_ in CASES} == set(BUDGETS)
+
+
+@pytest.mark.parametrize("route,url,kwargs,user", CASES, ids=[url for _, url, _, _ in CASES])
+def test_route_within_budget(api, route, url, kwargs, user):
+    if user:
+        kwargs = {**kwargs, "headers": getattr(api, user)["headers"]}
+    response, commands = api.request(route[0], url, **kwargs)
+    _check(response, commands, BUDGETS[route])
+
+
+def test_sync_with_token_within_budget(api):
+    headers = api.learner["headers"]
+    token = api.client.get("/api/sync", headers=headers).json()["next_token"]
+    response, commands = api.request("GET", f"/api/sync?since={token}", headers=headers)
+    _check(response, commands, 3)
+
+
+@pytest.mark.parametrize("method,url,kwargs,budget", [
+    ("PUT", "/api/progress", {"json": PROGRESS_UPDATE}, 4),
+    ("GET", "/api/progress/course/course-1", {}, 2),
+])
+def test_bitset_progress_within_budget(api, monkeypatch, method, url, kwargs, budget):
+    monkeypatch.setattr(server, "PROGRESS_STORE", "bitset")
+    response, commands = api.request(method, url, headers=api.learner["headers"], **kwargs)
+    _check(response, commands, budget)
+
+
+def test_enrollments_do_not_query_per_course(api):
+    headers = api.learner["headers"]
+    api.client.post("/api/enrollments", json={"course_id": "course-2", "terms_accepted": True}, headers=headers)
+    response, commands = api.request("GET", "/api/enrollments/my", headers=headers)
+    assert len(response.json()) == 2
+    _check(response, commands, BUDGETS[("GET", "/api/enrollments/my")])
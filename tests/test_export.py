@@ -0,0 +1,13 @@
+def test_only_admins_export_every_user(api):
+    instructor = api._user("instructor", "instructor@example.com", role="instructor")
+
+    response = api.client.get("/api/admin/export?kind=users", headers=instructor["headers"])
+    assert response.status_code == 403
+
+    response = api.client.get("/api/admin/export?kind=users&course_id=course-1", headers=instructor["headers"])
+    assert response.status_code == 200
+    assert "learner@example.com" in response.text
+
+    response = api.client.get("/api/admin/export?kind=users", headers=api.admin["headers"])
+    assert response.status_code == 200
+    assert "instructor@example.com" in response.text
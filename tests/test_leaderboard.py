@@ -0,0 +1,72 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+
+import server
+from leaderboard import StreakLeaderboard, live_streak
+
+TODAY = date(2026, 3, 10)
+YESTERDAY = TODAY - timedelta(days=1)
+
+
+def _user(user_id, streak, login_date, username=None):
+    return {"id": user_id, "streak_count": streak, "last_login_date": login_date.isoformat(),
+            "username": username or user_id}
+
+
+def test_ties_share_a_rank():
+    board = StreakLeaderboard()
+    board.load([_user("a", 5, TODAY), _user("b", 7, TODAY), _user("c", 5, YESTERDAY), _user("d", 2, TODAY)], TODAY)
+    assert [(entry["rank"], entry["streak_count"]) for entry in board.top(10, TODAY)] == [(1, 7), (2, 5), (2, 5), (4, 2)]
+    assert board.rank("a", TODAY) == board.rank("c", TODAY) == 2
+    assert board.rank("d", TODAY) == 4
+
+
+def test_expired_streaks_drop_out_when_the_day_rolls_over():
+    board = StreakLeaderboard()
+    board.load([_user("a", 5, TODAY), _user("b", 9, YESTERDAY), _user("stale", 20, TODAY - timedelta(days=2))], TODAY)
+    assert len(board) == 2
+
+    tomorrow = TODAY + timedelta(days=1)
+    assert [entry["username"] for entry in board.top(10, tomorrow)] == ["a"]
+    assert board.rank("b", tomorrow) is None
+    assert len(board) == 1
+
+
+def test_update_and_rename():
+    board = StreakLeaderboard()
+    board.load([_user("a", 5, TODAY), _user("b", 3, YESTERDAY)], TODAY)
+
+    # Logging in again moves the entry to today's bucket and re-ranks it
+    board.update("b", 6, "b", TODAY.isoformat(), TODAY)
+    assert board.rank("b", TODAY) == 1
+    assert board.top(1, TODAY + timedelta(days=1))[0]["username"] == "b"
+
+    board.rename("a", "alice")
+    assert [entry["username"] for entry in board.top(10, TODAY)] == ["b", "alice"]
+    board.rename("nobody", "ghost")
+    assert len(board) == 2
+
+
+def test_live_streak():
+    assert live_streak(4, TODAY.isoformat(), TODAY) == 4
+    assert live_streak(4, YESTERDAY.isoformat(), TODAY) == 4
+    assert live_streak(4, (TODAY - timedelta(days=2)).isoformat(), TODAY) == 0
+    assert live_streak(4, None, TODAY) == 0
+
+
+def test_my_lapsed_streak_reads_zero(api):
+    lapsed = (datetime.now(timezone.utc).date() - timedelta(days=3)).isoformat()
+    asyncio.run(api.db.users.update_one({"id": api.learner["id"]}, {"$set": {"last_login_date": lapsed}}))
+    response = api.client.get("/api/leaderboard/streaks", headers=api.learner["headers"])
+    assert response.json()["me"]["streak_count"] == 0
+
+
+def test_refresh_picks_up_logins_from_other_instances(api):
+    today = datetime.now(timezone.utc).date().isoformat()
+    # Written by another instance: this one's leaderboard never saw the login
+    asyncio.run(api.db.users.insert_one(
+        {"id": "elsewhere", "username": "elsewhere", "streak_count": 50, "last_login_date": today}
+    ))
+    asyncio.run(server.refresh_streak_leaderboard())
+    top = api.client.get("/api/leaderboard/streaks?limit=1", headers=api.learner["headers"]).json()["entries"]
+    assert top == [{"rank": 1, "username": "elsewhere", "streak_count": 50}]
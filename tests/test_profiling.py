@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+from profiling import ProfilingMiddleware
+
+
+async def _handler(scope, receive, send):
+    await asyncio.sleep(0.05)
+    _burn(0.05)
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def _burn(seconds):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(200))
+    return total
+
+
+def _request(middleware, headers=()):
+    scope = {"type": "http", "method": "GET", "path": "/api/thing", "headers": list(headers)}
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    asyncio.run(middleware(scope, receive, send))
+
+
+def _weights(path):
+    weights = {}
+    for line in path.read_text().splitlines():
+        stack, weight = line.rsplit(" ", 1)
+        weights[stack] = int(weight)
+    return weights
+
+
+def test_cpu_and_await_are_weighted_by_wall_time(tmp_path):
+    middleware = ProfilingMiddleware(_handler, str(tmp_path), token="secret")
+    _request(middleware, [(b"x-profile", b"secret")])
+
+    [profile] = tmp_path.glob("*.collapsed")
+    weights = _weights(profile)
+    cpu = sum(weight for stack, weight in weights.items() if "_burn" in stack)
+    waiting = sum(weight for stack, weight in weights.items() if "sleep" in stack)
+    assert 0.5 < cpu / waiting < 2
+    # Both halves add up to roughly the request's 100ms of wall time
+    assert 70_000 < cpu + waiting < 200_000
+    assert not any("stop (" in stack or "join (" in stack for stack in weights)
+
+
+def test_token_gates_profiling(tmp_path):
+    middleware = ProfilingMiddleware(_handler, str(tmp_path), token="secret")
+    _request(middleware)
+    _request(middleware, [(b"x-profile", b"wrong")])
+    assert list(tmp_path.glob("*.collapsed")) == []
+
+
+def test_keeps_only_the_newest_profiles(tmp_path):
+    middleware = ProfilingMiddleware(_handler, str(tmp_path), token="secret", max_profiles=2)
+    for _ in range(3):
+        _request(middleware, [(b"x-profile", b"secret")])
+        time.sleep(0.01)  # distinct mtimes
+    assert len(list(tmp_path.glob("*.collapsed"))) == 2
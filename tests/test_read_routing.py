@@ -0,0 +1,54 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+from motor.motor_asyncio import AsyncIOMotorClient
+
+import server
+from catalog import Catalog, bump_catalog_version
+from read_routing import read_preference, routed_database
+
+# e.g. a local single-host replica set: mongod --replSet rs0 (then rs.initiate() once)
+REPLICA_SET_URL = os.environ.get("MONGO_TEST_REPLICA_SET_URL")
+
+
+def test_read_preference_from_name():
+    assert read_preference("primary", 90).document == {"mode": "primary"}
+    assert read_preference("secondaryPreferred", 120).document == {
+        "mode": "secondaryPreferred", "maxStalenessSeconds": 120
+    }
+    assert read_preference("nearest").document == {"mode": "nearest"}
+    with pytest.raises(ValueError):
+        read_preference("secondaryPreferred", 30)
+    with pytest.raises(ValueError):
+        read_preference("secondary-preferred")
+
+
+def test_routes_read_through_their_handles():
+    assert server.db.read_preference.mode == 0  # primary
+    for routed in (server.catalog_db, server.analytics_db):
+        assert routed.read_preference.document == {
+            "mode": "secondaryPreferred", "maxStalenessSeconds": server.READ_MAX_STALENESS_SECONDS
+        }
+        assert routed.name == server.db.name
+
+
+@pytest.mark.skipif(not REPLICA_SET_URL, reason="MONGO_TEST_REPLICA_SET_URL not set")
+def test_catalog_reload_on_replica_set():
+    async def run():
+        client = AsyncIOMotorClient(REPLICA_SET_URL, serverSelectionTimeoutMS=5000)
+        name = f"dexnote_routing_{uuid.uuid4().hex[:8]}"
+        primary = client[name]
+        secondary = routed_database(client, name, "secondaryPreferred", 90)
+        try:
+            await primary.courses.insert_one({"id": "course-1", "title": "Python"})
+            await bump_catalog_version(primary)
+            catalog = Catalog(refresh_seconds=0)
+            await catalog.ensure_fresh(secondary)
+            return catalog.version, list(catalog.courses)
+        finally:
+            await client.drop_database(name)
+            client.close()
+
+    assert asyncio.run(run()) == (1, ["course-1"])
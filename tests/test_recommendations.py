@@ -0,0 +1,82 @@
+import asyncio
+import math
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+import server
+from recommendations import RecommendationTable, build_neighbor_table
+
+
+def test_only_one_instance_holds_the_refresh_lease(api, monkeypatch):
+    assert asyncio.run(server._acquire_job_lease("recommendations", 3600))
+    # Renewable by its holder
+    assert asyncio.run(server._acquire_job_lease("recommendations", 3600))
+
+    # Another instance (or this one after a restart) waits for the lease to expire
+    monkeypatch.setattr(server, "INSTANCE_ID", "other-instance")
+    assert not asyncio.run(server._acquire_job_lease("recommendations", 3600))
+
+    asyncio.run(api.db.job_leases.update_one(
+        {"_id": "recommendations"}, {"$set": {"expires_at": datetime.now(timezone.utc) - timedelta(seconds=1)}}
+    ))
+    assert asyncio.run(server._acquire_job_lease("recommendations", 3600))
+
+
+def test_neighbors_are_cosine_similarities():
+    # a and b share u1 and u2; c only shares u2 with them
+    neighbors, popularity = build_neighbor_table(
+        ["u1", "u1", "u2", "u2", "u2", "u3"],
+        ["a", "b", "a", "b", "c", "c"],
+        [1.0] * 6,
+    )
+    assert popularity == {"a": 2, "b": 2, "c": 2}
+    assert [course for course, _ in neighbors["a"]] == ["b", "c"]
+    assert math.isclose(neighbors["a"][0][1], 1.0, rel_tol=1e-6)
+    assert math.isclose(neighbors["a"][1][1], 0.5, rel_tol=1e-6)
+    assert math.isclose(dict(neighbors["c"])["b"], 0.5, rel_tol=1e-6)
+
+
+def test_neighbors_keep_top_n_in_score_order():
+    users, courses = [], []
+    # Course "hub" co-occurs with x1 once, x2 twice, ... x5 five times
+    for k in range(1, 6):
+        for i in range(k):
+            users += [f"u{k}-{i}", f"u{k}-{i}"]
+            courses += ["hub", f"x{k}"]
+    neighbors, _ = build_neighbor_table(users, courses, [1.0] * len(users), top_n=3)
+    ranked = neighbors["hub"]
+    assert [course for course, _ in ranked] == ["x5", "x4", "x3"]
+    assert [score for _, score in ranked] == sorted((score for _, score in ranked), reverse=True)
+
+
+def test_empty_enrollments():
+    assert build_neighbor_table([], [], []) == ({}, {})
+
+
+def test_recommend_skips_enrolled_courses_and_falls_back_to_popular():
+    table = RecommendationTable()
+    table.replace(
+        {"a": [("b", 0.9), ("c", 0.25)], "b": [("a", 0.9), ("c", 0.5)]},
+        {"a": 10, "b": 8, "c": 5, "d": 50, "e": 20},
+        "2026-01-01T00:00:00+00:00",
+    )
+    # Scores from every enrolled course add up; enrolled courses are never suggested
+    assert table.recommend(["a", "b"], 1) == [("c", 0.75)]
+    # Not enough neighbors: the most popular unseen courses fill the rest
+    assert table.recommend(["a", "b"], 3) == [("c", 0.75), ("d", 0.0), ("e", 0.0)]
+    # Cold start
+    assert table.recommend([], 2) == [("d", 0.0), ("e", 0.0)]
+
+
+def test_neighbor_table_builds_100k_enrollments_within_a_second():
+    rng = np.random.default_rng(0)
+    size = 100_000
+    users = [f"u{i}" for i in rng.integers(0, 30_000, size)]
+    courses = [f"c{i}" for i in rng.integers(0, 200, size)]
+    weights = 1.0 + rng.random(size)
+    started = time.perf_counter()
+    neighbors, popularity = build_neighbor_table(users, courses, weights)
+    assert time.perf_counter() - started < 1.0
+    assert len(popularity) == 200 and all(len(ranked) == 10 for ranked in neighbors.values())
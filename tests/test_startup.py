@@ -0,0 +1,55 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+
+import server
+from enrollment_dedupe import ensure_unique_index, merge
+
+from tests.conftest import BACKEND_DIR
+from tests.fake_motor import FakeDatabase
+
+
+def test_not_ready_until_startup_has_run():
+    response = TestClient(server.app).get("/api/health")
+    assert response.status_code == 503
+
+
+def test_ready_after_startup(api):
+    response = api.client.get("/api/health")
+    assert response.status_code == 200
+    assert {"warm_up", "create_indexes", "load_catalog"} <= set(response.json()["startup_seconds"])
+
+
+def test_import_does_not_load_numpy():
+    code = "import sys, server; print('numpy' in sys.modules)"
+    env = {**os.environ, "MONGO_URL": "mongodb://localhost:27017", "DB_NAME": "dexnote_test"}
+    output = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "False"
+
+
+def test_unique_enrollment_index_replaces_legacy_index():
+    db = FakeDatabase()
+    asyncio.run(db.enrollments.create_index([("user_id", 1), ("course_id", 1)]))
+    assert asyncio.run(ensure_unique_index(db))
+    assert asyncio.run(db.enrollments.index_information())["user_id_1_course_id_1"]["unique"]
+
+
+def test_duplicate_enrollments_do_not_block_startup(caplog):
+    db = FakeDatabase()
+    duplicates = [
+        {"user_id": "u", "course_id": "c", "enrolled_at": "2025-01-02", "progress": 50.0, "completion_bits": {"0": 0b10}},
+        {"user_id": "u", "course_id": "c", "enrolled_at": "2025-01-01", "progress": 25.0, "completion_bits": {"0": 0b1}},
+    ]
+    asyncio.run(db.enrollments.create_index([("user_id", 1), ("course_id", 1)]))
+    asyncio.run(db.enrollments.insert_many(duplicates))
+    assert not asyncio.run(ensure_unique_index(db))
+    assert "dedupe_enrollments.py" in caplog.text
+
+    keeper, update, removed = merge(asyncio.run(db.enrollments.find({}).to_list(None)))
+    assert keeper["enrolled_at"] == "2025-01-01"
+    assert update["progress"] == 50.0 and update["completion_bits"] == {"0": 0b11}
+    assert len(removed) == 1
@@ -0,0 +1,87 @@
+import asyncio
+from datetime import datetime
+
+import server
+
+
+def _sync(api, token=None):
+    url = f"/api/sync?since={token}" if token else "/api/sync"
+    response = api.client.get(url, headers=api.learner["headers"])
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_incremental_sync_returns_later_writes(api):
+    first = _sync(api)
+    assert [record["module_id"] for record in first["progress"]] == ["module-1-1"]
+    assert all(record["updated_at"] for record in first["enrollments"] + first["progress"])
+
+    api.client.put("/api/progress", headers=api.learner["headers"],
+                   json={"module_id": "module-1-2", "course_id": "course-1", "completed": True})
+    later = _sync(api, first["next_token"])
+    assert "module-1-2" in {record["module_id"] for record in later["progress"]}
+    assert [round(enrollment["progress"]) for enrollment in later["enrollments"]] == [67]
+
+
+def _sync_all(api, token=None):
+    records, pages = [], 0
+    while True:
+        page = _sync(api, token)
+        records += page["progress"]
+        token = page["next_token"]
+        pages += 1
+        assert pages < 20, "sync never finished"
+        if not page["has_more"]:
+            return records, token
+
+
+def test_records_without_updated_at_are_each_delivered_once(api, monkeypatch):
+    monkeypatch.setattr(server, "SYNC_PAGE_SIZE", 2)
+    asyncio.run(api.db.progress.insert_many([
+        {"id": f"legacy-{i}", "user_id": api.learner["id"], "course_id": "course-1",
+         "module_id": f"legacy-{i}", "completed": True, **({"updated_at": "2024-01-01T00:00:00"} if i == 1 else {})}
+        for i in range(3)
+    ]))
+    records, _ = _sync_all(api)
+    assert sorted(record["module_id"] for record in records) == ["legacy-0", "legacy-1", "legacy-2", "module-1-1"]
+
+
+def test_paging_through_one_shared_stamp_terminates(api, monkeypatch):
+    monkeypatch.setattr(server, "SYNC_PAGE_SIZE", 2)
+    stamp = datetime(2026, 1, 1)
+    asyncio.run(api.db.progress.insert_many([
+        {"id": f"same-{i}", "user_id": api.learner["id"], "course_id": "course-1",
+         "module_id": f"same-{i}", "completed": True, "updated_at": stamp}
+        for i in range(5)
+    ]))
+    records, token = _sync_all(api)
+    assert sorted(record["module_id"] for record in records) == ["module-1-1", *(f"same-{i}" for i in range(5))]
+
+    # Caught up: only the overlap window comes back
+    assert [record["module_id"] for record in _sync(api, token)["progress"]] == ["module-1-1"]
+
+
+def test_bitset_sync_expands_completion(api, monkeypatch):
+    monkeypatch.setattr(server, "PROGRESS_STORE", "bitset")
+    headers = api.learner["headers"]
+    for module_id, completed in (("module-1-2", True), ("module-1-1", False)):
+        api.client.put("/api/progress", headers=headers,
+                       json={"module_id": module_id, "course_id": "course-1", "completed": completed})
+
+    page = _sync(api)
+    assert {record["module_id"]: record["completed"] for record in page["progress"]} == {
+        "module-1-1": False, "module-1-2": True, "module-1-3": False,
+    }
+    assert all("completion_bits" not in e and "completion_times" not in e for e in page["enrollments"])
+
+    enrollments = api.client.get("/api/enrollments/my", headers=headers).json()
+    assert all("completion_bits" not in e and "completion_times" not in e for e in enrollments)
+
+
+def test_rejected_enrollment_does_not_touch_the_existing_one(api):
+    query = {"user_id": api.learner["id"], "course_id": "course-1"}
+    before = asyncio.run(api.db.enrollments.find_one(query))
+    response = api.client.post("/api/enrollments", headers=api.learner["headers"],
+                               json={"course_id": "course-1", "terms_accepted": True})
+    assert response.status_code == 400
+    assert asyncio.run(api.db.enrollments.find_one(query)) == before
@@ -0,0 +1,44 @@
+import asyncio
+import io
+from concurrent.futures import ProcessPoolExecutor
+
+import server
+from user_import import import_users, read_rows
+
+from tests.fake_motor import FakeDatabase
+
+CSV = """username,email,password
+ada,ada@example.com,pw-ada
+grace,grace@example.com,pw-grace
+ada2,ada@example.com,pw-dup
+taken,taken@example.com,pw
+bad,not-an-email,pw
+alan,alan@example.com,
+"""
+
+
+def test_import_dedupes_and_reports_failures():
+    db = FakeDatabase()
+
+    async def run():
+        await db.users.create_index("email")
+        await db.users.create_index("username")
+        await db.users.insert_one({"id": "existing", "username": "someone", "email": "taken@example.com"})
+        db.log.reset()
+        with ProcessPoolExecutor(2) as executor:
+            return await import_users(db, read_rows(io.StringIO(CSV), "csv"), executor, batch_size=10)
+
+    summary = asyncio.run(run())
+    assert summary["imported"] == 2
+    assert [(failure["line"], failure["error"]) for failure in summary["failures"]] == [
+        (4, "Duplicate email in file"),
+        (5, "Email already registered"),
+        (6, "email: value is not a valid email address: An email address must have an @-sign."),
+        (7, "password: String should have at least 1 character"),
+    ]
+    # One indexed duplicate check and one insert for the whole batch
+    assert [(c.name, c.indexed) for c in db.log.commands] == [("find", True), ("insert", True)]
+
+    ada = asyncio.run(db.users.find_one({"email": "ada@example.com"}, {"_id": 0}))
+    assert server.verify_password("pw-ada", ada.pop("password_hash"))
+    assert server.User(**ada).model_dump() == ada